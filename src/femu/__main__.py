@@ -3,24 +3,25 @@ import os
 import signal
 import sys
 import argparse
+import importlib.util
 
-from .dbInterface import checkConnection
+from .dbInterface import checkAuth
 from .emulator import Emulator
-from .emulatorConfig import emulatorConfig, _DEFAULT_BINARIES, _DEFAULT_SCRIPTS
+from .emulatorConfig import emulatorConfig, _DEFAULT_BINARIES, _DEFAULT_SCRIPTS, _HASH_ALGORITHMS
 from .qemuInterface import kill_all_qemu
 
 logger = logging.getLogger(__name__)
 
 # Configure the top-level "femu" logger so all femu.* submodules inherit the
-# handler and level, plus the extractor package.
+# handler and level, plus the extractor package. --verbose lowers both to DEBUG.
 _formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 _handler = logging.StreamHandler()
 _handler.setFormatter(_formatter)
 
-logging.getLogger("femu").setLevel(logging.DEBUG)
+logging.getLogger("femu").setLevel(logging.INFO)
 logging.getLogger("femu").addHandler(_handler)
 
-logging.getLogger("femu_extractor").setLevel(logging.DEBUG)
+logging.getLogger("femu_extractor").setLevel(logging.INFO)
 logging.getLogger("femu_extractor").addHandler(_handler)
 
 def parseArguments() -> argparse.Namespace:
@@ -33,7 +34,9 @@ def parseArguments() -> argparse.Namespace:
     parser.add_argument("-bin", "--binaries", type=str, help="Path to the binaries directory.", default=_DEFAULT_BINARIES)
     parser.add_argument("-sql", type=str, help="IP of postgreSQL database.", default=None)
     parser.add_argument("-p", "--port", type=int, help="Port of the postgreSQL database.", default=5432)
+    parser.add_argument("--hash", type=str, choices=_HASH_ALGORITHMS, help="Hash used to fingerprint firmware images (blake3 needs the blake3 package).", default="sha256")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode (nc/telnet shell access in guest).", default=False)
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging.", default=False)
     
     args = parser.parse_args()
     return args
@@ -43,23 +46,78 @@ def checkArguments(args: argparse.Namespace):
         logger.warning("No PostgreSQL IP provided. Some features may not work.")
     else:
         # Check connection to PostgreSQL database
-        if checkConnection(args.sql, args.port):
+        if checkAuth(args.sql, args.port):
             logger.info("Successfully connected to PostgreSQL database.")
         else:
             logger.error("Failed to connect to PostgreSQL database.")
             exit(1)
             
+    if args.hash == "blake3" and importlib.util.find_spec("blake3") is None:
+        # Checked once here rather than failing on every image
+        logger.error("--hash blake3 requires the 'blake3' package (pip install femu[blake3]).")
+        exit(1)
+
     if not os.path.exists(args.input):
         logger.error(f"Input path '{args.input}' does not exist.")
         exit(1)
         
-    if not os.path.exists(args.output):
-        try:
-            os.makedirs(args.output)
-            logger.info(f"Output directory '{args.output}' created.")
-        except Exception as e:
-            logger.error(f"Failed to create output directory '{args.output}': {e}")
-            exit(1)
+    try:
+        os.makedirs(args.output, exist_ok=True)
+    except OSError as e:
+        logger.error(f"Failed to create output directory '{args.output}': {e}")
+        exit(1)
+
+def iterInputs(inputPath: str):
+    """
+    Yields the firmware images to process: inputPath itself, or the files directly inside it
+    when it is a directory, as they are read.
+
+    Args:
+        inputPath (str): Path to a firmware image or a directory of images.
+    """
+    if not os.path.isdir(inputPath):
+        yield inputPath
+        return
+
+    # Entry types come from the directory read; only symlinks need a stat to classify
+    with os.scandir(inputPath) as it:
+        for entry in it:
+            if entry.is_file():
+                yield entry.path
+
+def setVerbose(verbose: bool) -> None:
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.getLogger("femu").setLevel(level)
+    logging.getLogger("femu_extractor").setLevel(level)
+
+def runImage(inputFile: str, args: argparse.Namespace) -> None:
+    """
+    Runs the selected mode on one firmware image.
+
+    Args:
+        inputFile (str): Path to the firmware image.
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    em = Emulator(emulatorConfig(
+        firmwarePath=inputFile,
+        outputPath=args.output,
+        brand=args.brand,
+        scriptsPath=args.scripts,
+        binariesPath=args.binaries,
+        sqlIP=args.sql,
+        sqlPort=args.port,
+        debug=args.debug,
+        hashAlgorithm=args.hash,
+    ))
+    logger.info(f"Initialized emulator for {inputFile} in mode {args.mode} with brand {args.brand}.")
+
+    modes = {
+        "check":   em.explore,
+        "boot":    em.boot,
+        "debug":   em.debug,
+        "analyze": em.analyze,
+    }
+    modes[args.mode]()
 
 def _handle_shutdown(signum, frame):
     logger.info(f"Received signal {signum} — shutting down.")
@@ -71,33 +129,14 @@ def main():
     signal.signal(signal.SIGINT, _handle_shutdown)
 
     args = parseArguments()
+    setVerbose(args.verbose)
     checkArguments(args)
     
-    if os.path.isdir(args.input):
-        inputFiles = [os.path.join(args.input, f) for f in os.listdir(args.input) if os.path.isfile(os.path.join(args.input, f))]
-    else:
-        inputFiles = [args.input]
-        
-    for inputFile in inputFiles:
-        em = Emulator(emulatorConfig(
-            firmwarePath=inputFile,
-            outputPath=args.output,
-            brand=args.brand,
-            scriptsPath=args.scripts,
-            binariesPath=args.binaries,
-            sqlIP=args.sql,
-            sqlPort=args.port,
-            debug=args.debug,
-        ))
-        logger.info(f"Initialized emulator for {inputFile} in mode {args.mode} with brand {args.brand}.")
-
-        modes = {
-            "check":   em.explore,
-            "boot":    em.boot,
-            "debug":   em.debug,
-            "analyze": em.analyze,
-        }
-        modes[args.mode]()
+    # Images run one at a time: every QEMU instance forwards the same fixed host ports and
+    # uses the same TAP subnet. For parallel runs use tools/femu-batch.py, which isolates
+    # each image in its own container.
+    for inputFile in iterInputs(args.input):
+        runImage(inputFile, args)
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
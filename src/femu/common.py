@@ -17,28 +17,31 @@ class Architecture(Enum):
     POWERPC = ("POWERPC", "powerpc")
     UNKNOWN = ("UNKNOWN", "unknown")
 
+    def __init__(self, ident: str, short: str):
+        # Unpacked from the value tuple once, so the accessors below skip the indexing
+        self._ident = ident
+        self._short = short
+
     def __str__(self):
-        return self.value[1]
-    
-    # Create a comparison method to check if two architectures are the same
-    def __eq__(self, other):
-        if isinstance(other, Architecture):
-            return self.value[0] == other.value[0]
-        return False
+        return self._short
     
     def identifier(self):
-        return self.value[0]
+        return self._ident
 
 class Endianess(Enum):
     LITTLE = ("LSB", "el")
     BIG = ("MSB", "eb")
     UNKNOWN = ("UNKNOWN", "unknown")
+
+    def __init__(self, ident: str, short: str):
+        self._ident = ident
+        self._short = short
     
     def __str__(self):
-        return self.value[1]
+        return self._short
     
     def identifier(self):
-        return self.value[0]
+        return self._ident
     
 GIGA = 1024 * 1024 * 1024
 MEGA = 1024 * 1024
@@ -1,4 +1,5 @@
 """All PostgreSQL operations for FEMU. No DB logic should live outside this module."""
+import functools
 import logging
 
 from .dbInterface import DBInterface
@@ -6,16 +7,24 @@ from .dbInterface import DBInterface
 logger = logging.getLogger(__name__)
 
 
+def dbSession(sqlIP: str, sqlPort: int):
+    """
+    Context manager that runs every DB call made inside it on this thread, in this module
+    or elsewhere, on one pooled connection and commits them as a single transaction.
+    """
+    return DBInterface(sqlIP, sqlPort).session()
+
+
 def upsertBrand(name: str, sqlIP: str, sqlPort: int) -> int | None:
     """Insert brand if not present, return its id."""
     try:
-        with DBInterface(sqlIP, sqlPort) as cur:
-            cur.execute(
-                "INSERT INTO brand (name) VALUES (%s) ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name RETURNING id",
+        db = DBInterface(sqlIP, sqlPort)
+        with db:
+            row = db.executePrepared(
+                "femu_upsert_brand",
+                "INSERT INTO brand (name) VALUES ($1) ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name RETURNING id",
                 (name,),
-            )
-            row = cur.fetchone()
-            cur.connection.commit()
+            ).fetchone()
             return row[0] if row else None
     except Exception as e:
         logger.error(f"Failed to upsert brand '{name}': {e}")
@@ -29,51 +38,72 @@ def upsertImage(tag: str, filename: str, firmwareHash: str,
     Returns the integer DB id.
     """
     try:
-        with DBInterface(sqlIP, sqlPort) as cur:
-            cur.execute(
+        db = DBInterface(sqlIP, sqlPort)
+        with db:
+            row = db.executePrepared(
+                "femu_upsert_image",
                 """
                 INSERT INTO image (filename, brand_id, hash)
-                VALUES (%s, %s, %s)
+                VALUES ($1, $2, $3)
                 ON CONFLICT (hash) DO UPDATE SET filename = EXCLUDED.filename
                 RETURNING id
                 """,
                 (filename, brandId, firmwareHash),
-            )
-            row = cur.fetchone()
-            cur.connection.commit()
+            ).fetchone()
             return row[0] if row else None
     except Exception as e:
         logger.error(f"Failed to upsert image '{filename}': {e}")
         return None
 
 
-def updateImageField(dbId: int, field: str, value: str,
-                     sqlIP: str, sqlPort: int) -> bool:
-    """Update a single field on an image row. field must be a known column name."""
-    _ALLOWED = {"arch", "kernel_version", "rootfs_extracted", "kernel_extracted"}
-    if field not in _ALLOWED:
-        logger.error(f"updateImageField: unknown field '{field}'")
+# Updatable image columns, in the fixed order they appear in generated statements
+_IMAGE_FIELDS = ("arch", "kernel_version", "rootfs_extracted", "kernel_extracted")
+
+
+@functools.lru_cache(maxsize=None)
+def _imageUpdateSql(columns: tuple[str, ...]) -> tuple[str, str]:
+    """Prepared statement name and SQL text for updating `columns`, built once per column set."""
+    assignments = ", ".join(f"{column} = ${i}" for i, column in enumerate(columns, start=1))
+    return f"femu_update_image_{'_'.join(columns)}", f"UPDATE image SET {assignments} WHERE id = ${len(columns) + 1}"
+
+
+def updateImageFields(dbId: int, fields: dict[str, str],
+                      sqlIP: str, sqlPort: int) -> bool:
+    """Update several fields on an image row in one statement. Keys must be known column names."""
+    unknown = set(fields).difference(_IMAGE_FIELDS)
+    if unknown:
+        logger.error(f"updateImageFields: unknown field(s) {sorted(unknown)}")
         return False
+    if not fields:
+        return True
+    # Column names only ever come from the whitelist; values are bound by psycopg2
+    columns = tuple(column for column in _IMAGE_FIELDS if column in fields)
     try:
-        with DBInterface(sqlIP, sqlPort) as cur:
-            cur.execute(f"UPDATE image SET {field} = %s WHERE id = %s", (value, dbId))
-            cur.connection.commit()
+        db = DBInterface(sqlIP, sqlPort)
+        with db:
+            db.executePrepared(*_imageUpdateSql(columns), (*(fields[c] for c in columns), dbId))
         return True
     except Exception as e:
-        logger.error(f"Failed to update image field '{field}': {e}")
+        logger.error(f"Failed to update image fields {sorted(fields)}: {e}")
         return False
 
 
+def updateImageField(dbId: int, field: str, value: str,
+                     sqlIP: str, sqlPort: int) -> bool:
+    """Update a single field on an image row. field must be a known column name."""
+    return updateImageFields(dbId, {field: value}, sqlIP, sqlPort)
+
+
 def getBrandByHash(firmwareHash: str, sqlIP: str, sqlPort: int) -> str | None:
     """Return the brand name for a previously seen firmware hash, or None."""
     try:
-        with DBInterface(sqlIP, sqlPort) as cur:
-            cur.execute("SELECT brand_id FROM image WHERE hash = %s", (firmwareHash,))
-            row = cur.fetchone()
-            if not row:
-                return None
-            cur.execute("SELECT name FROM brand WHERE id = %s", (row[0],))
-            row = cur.fetchone()
+        db = DBInterface(sqlIP, sqlPort)
+        with db:
+            row = db.executePrepared(
+                "femu_brand_by_hash",
+                "SELECT b.name FROM image i JOIN brand b ON b.id = i.brand_id WHERE i.hash = $1",
+                (firmwareHash,),
+            ).fetchone()
             return row[0] if row else None
     except Exception as e:
         logger.warning(f"Brand lookup failed: {e}")
@@ -1,7 +1,13 @@
 import psycopg2
+import psycopg2.pool
+import io
+import threading
 import logging
+import atexit
 
-from typing import Optional
+from contextlib import contextmanager
+from psycopg2.extras import execute_values
+from typing import Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -10,49 +16,182 @@ USERNAME = "femu"
 PASSWORD = "femu"
 DBNAME = "firmware"
 
-def checkConnection(host:str, port:int) -> bool:
-    conn = None
-    ret = True
+POOL_MINCONN = 1
+POOL_MAXCONN = 8
+POOL_CONNECT_TIMEOUT = 5  # seconds; bounds the first, lazy connect when the server is down
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which server-side prepared statements exist on it."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+
+# One pool per (host, port), shared by every DBInterface in the process so a
+# firmware run pays the connect/auth handshake once instead of once per query.
+_pools: dict[tuple[str, int], psycopg2.pool.ThreadedConnectionPool] = {}
+_poolsLock = threading.Lock()
+
+def getPool(host: str, port: int) -> psycopg2.pool.ThreadedConnectionPool:
+    """Return the connection pool for host:port, creating it on first use."""
+    key = (host, port)
+    with _poolsLock:
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = psycopg2.pool.ThreadedConnectionPool(
+                POOL_MINCONN,
+                POOL_MAXCONN,
+                dbname=DBNAME,
+                user=USERNAME,
+                password=PASSWORD,
+                host=host,
+                port=port,
+                connect_timeout=POOL_CONNECT_TIMEOUT,
+                connection_factory=PreparingConnection
+            )
+            _pools[key] = pool
+        return pool
+
+def closePools() -> None:
+    """Close every pooled connection. Registered to run at interpreter exit."""
+    with _poolsLock:
+        for pool in _pools.values():
+            if not pool.closed:
+                pool.closeall()
+        _pools.clear()
+
+atexit.register(closePools)
+
+# Session opened with DBInterface.session() on the current thread, per (host, port)
+_sessions = threading.local()
+
+def _activeSession(host: str, port: int) -> Optional["DBInterface"]:
+    return getattr(_sessions, "active", {}).get((host, port))
+
+def _executeSql(name: str, nparams: int) -> str:
+    if not nparams:
+        return f"EXECUTE {name}"
+    return f"EXECUTE {name} ({', '.join(['%s'] * nparams)})"
+
+# Escapes for COPY's text format; NULL is written as \N
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+def _copyValue(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(_COPY_ESCAPES)
+
+def checkAuth(host: str, port: int) -> bool:
+    """
+    Login check against the database. Borrows a connection from the pool,
+    so a successful call also leaves the pool warm for later queries.
+    """
     try:
-        conn = psycopg2.connect(
-            dbname=DBNAME,
-            user=USERNAME,
-            password=PASSWORD,
-            host=host,
-            port=port
-        )
+        pool = getPool(host, port)
+        conn = pool.getconn()
+        pool.putconn(conn)
     except Exception as e:
         logger.error(f"Error connecting to PostgreSQL database: {e}")
-        ret = False
-    
-    finally:
-        if conn:
-            conn.close()
+        return False
 
-    return ret
+    return True
 
 class DBInterface:
     def __init__(self, host: str, port: int = 5432):
         self.host: str = host
         self.port: int = port
+        self.pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
         self.conn: Optional[psycopg2.extensions.connection] = None
         self.cursor: Optional[psycopg2.extensions.cursor] = None
+        self.sessionOwner: Optional["DBInterface"] = None
+        self.sessionFailed: bool = False
 
     def connect(self) -> Optional[psycopg2.extensions.cursor]:
         try:
-            self.conn = psycopg2.connect(
-                dbname=DBNAME,
-                user=USERNAME,
-                password=PASSWORD,
-                host=self.host,
-                port=self.port
-            )
+            owner = _activeSession(self.host, self.port)
+            if owner is not None and owner is not self:
+                # Inside a session: share its connection and transaction
+                self.sessionOwner = owner
+                self.conn = owner.conn
+            else:
+                self.pool = getPool(self.host, self.port)
+                self.conn = self.pool.getconn()
             self.cursor = self.conn.cursor()
             return self.cursor
         except Exception as e:
             logger.error(f"Error connecting to PostgreSQL database: {e}")
             raise e
 
+    @contextmanager
+    def session(self):
+        """
+        Holds one pooled connection for the whole block. Every DBInterface for the same
+        host and port opened on this thread inside the block reuses it, and all their
+        statements are committed together on exit (or rolled back if any of them failed).
+
+        Yields:
+            psycopg2.extensions.cursor: A cursor on the session connection.
+        """
+        cur = self.__enter__()
+        key = (self.host, self.port)
+        active = _sessions.__dict__.setdefault("active", {})
+        owns = self.sessionOwner is None
+        if owns:
+            active[key] = self
+        excInfo = (None, None, None)
+        try:
+            yield cur
+        except BaseException as e:
+            excInfo = (type(e), e, e.__traceback__)
+            raise
+        finally:
+            if owns:
+                del active[key]
+                if excInfo[0] is None and self.sessionFailed:
+                    logger.error("A statement in the database session failed; rolling the session back.")
+                    excInfo = (RuntimeError, None, None)
+            self.__exit__(*excInfo)
+
+    def executePrepared(self, name: str, sql: str, params: tuple = ()) -> psycopg2.extensions.cursor:
+        """
+        Runs `sql`, written with $1, $2, ... placeholders, as the server-side prepared statement
+        `name`. The statement is planned once per pooled connection and reused by later calls.
+        Returns the cursor so results can be fetched. Must be called inside the `with` block.
+        """
+        if not self.cursor or not self.conn:
+            raise Exception("Not connected to the database.")
+        if name not in self.conn.prepared:
+            self.cursor.execute(f"PREPARE {name} AS {sql}")
+            self.conn.prepared.add(name)
+        self.cursor.execute(_executeSql(name, len(params)), params)
+        return self.cursor
+
+    def insertMany(self, sql: str, rows: list, pageSize: int = 100, fetch: bool = False) -> list:
+        """
+        Expands the single `VALUES %s` placeholder in `sql` into multi-row inserts of `pageSize` rows.
+        With fetch=True, returns the rows produced by a RETURNING clause. Must be called inside
+        the `with` block, which commits on exit.
+        """
+        if not self.cursor or not self.conn:
+            raise Exception("Not connected to the database.")
+        result = execute_values(self.cursor, sql, rows, page_size=pageSize, fetch=fetch)
+        return result if fetch else []
+
+    def copyRows(self, table: str, columns: tuple[str, ...], rows: Iterable[tuple]) -> None:
+        """
+        Bulk-loads `rows` into `table` with COPY ... FROM STDIN, which is much faster than INSERT
+        for large loads but returns nothing. Must be called inside the `with` block, which commits on exit.
+        """
+        if not self.cursor or not self.conn:
+            raise Exception("Not connected to the database.")
+        buf = io.StringIO()
+        for row in rows:
+            buf.write("\t".join(map(_copyValue, row)))
+            buf.write("\n")
+        buf.seek(0)
+        self.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+
     def __enter__(self):
         cur = self.connect()
         if not cur:
@@ -62,5 +201,23 @@ class DBInterface:
     def __exit__(self, exc_type, exc_value, traceback):
         if self.cursor:
             self.cursor.close()
-        if self.conn:
-            self.conn.close()
+            self.cursor = None
+        if self.sessionOwner is not None:
+            # The session owner commits or rolls back for everyone
+            if exc_type is not None:
+                self.sessionOwner.sessionFailed = True
+            self.sessionOwner = None
+            self.conn = None
+            return
+        if self.conn and self.pool:
+            # Never hand a connection with an open transaction back to the pool
+            try:
+                if not self.conn.closed:
+                    if exc_type is None:
+                        self.conn.commit()
+                    else:
+                        self.conn.rollback()
+            finally:
+                self.pool.putconn(self.conn, close=bool(self.conn.closed))
+                self.conn = None
+                self.sessionFailed = False
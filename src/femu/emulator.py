@@ -1,27 +1,30 @@
-import hashlib
 import json
 import logging
 import shutil
 import os
+import re
 import signal
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from time import sleep, monotonic
 
-from .common import Architecture, Endianess, NetworkResult, ProbeResult, GIGA
+from .common import Architecture, Endianess, NetworkResult, ProbeResult, GIGA, MEGA
 from .qemuInterface import Qemu
 from .emulatorConfig import emulatorConfig
-from .db import upsertBrand, upsertImage, updateImageField, getBrandByHash
+from .db import dbSession, upsertBrand, upsertImage, updateImageFields, getBrandByHash
 from .util import (
     checkArch,
-    strings,
+    fileDigest,
+    findTaggedStrings,
     checkCompatibility,
-    getFilesInfo,
-    getLinksInfo,
+    getTarballInfo,
     getObjectIds,
     insertObjectsToImage,
     insertLinksToImage,
     createRawImg,
     mountedImage,
+    unpackArchive,
     unmountImage,
 )
 
@@ -38,12 +41,30 @@ from femu_extractor import extract
 # Use the root logger, do not set up a separate logger or handler here.
 logger = logging.getLogger(__name__)
 
+# Markers looked up in the kernel image: located with mmap.find, then matched in place
+# by _KERNEL_MARKERS_RE, reproducing `string.split(marker)[1].split(" ")[0]`. The captured
+# token runs up to the next space, non-printable byte or repeat of its own marker. Any
+# "Linux version" in a string makes the banner win over an init= in the same string; a
+# bare banner with no space after it (group `banner`) yields nothing, unless a real
+# "Linux version " follows it in the string.
+_KERNEL_MARKERS = (b"Linux version", b"init=")
+_KERNEL_PRINTABLE = rb"[\x20-\x7e\t\n\x0b\x0c\r]"
+_KERNEL_TOKEN = rb"[\x21-\x7e\t\n\x0b\x0c\r]"
+_KERNEL_MARKERS_RE = re.compile(
+    rb"Linux version (?P<version>(?:(?!Linux version )" + _KERNEL_TOKEN + rb")*)"
+    rb"|Linux version(?P<banner>)(?!" + _KERNEL_PRINTABLE + rb"*Linux version )"
+    rb"|init=(?!" + _KERNEL_PRINTABLE + rb"*Linux version)(?P<init>(?:(?!init=)" + _KERNEL_TOKEN + rb")*)"
+)
+
 class Emulator:
+    # Firmware tag -> brand name, shared by every Emulator in the process so
+    # re-running a firmware (check, then boot/debug/analyze) skips the DB lookup.
+    _brandCache: dict[str, str] = {}
+
     def __init__(self, config: emulatorConfig):
         self.config = config
 
-        with open(self.config.firmwarePath, "rb") as f:
-            self.tag = hashlib.sha256(f.read()).hexdigest()
+        self.tag = fileDigest(self.config.firmwarePath, self.config.hashAlgorithm)
 
         self.imagePath = os.path.join(self.config.outputPath, "images")
         self.workDir   = os.path.join(self.config.outputPath, "workDir")
@@ -51,8 +72,13 @@ class Emulator:
         self.createDirectories()
 
         if self.config.brand == "auto":
-            if self.config.sqlIP:
-                self.brand = getBrandByHash(self.tag, self.config.sqlIP, self.config.sqlPort) or "unknown"
+            if self.tag in Emulator._brandCache:
+                self.brand = Emulator._brandCache[self.tag]
+            elif self.config.sqlIP:
+                brand = getBrandByHash(self.tag, self.config.sqlIP, self.config.sqlPort)
+                if brand:
+                    Emulator._brandCache[self.tag] = brand
+                self.brand = brand or "unknown"
             else:
                 logger.warning("Brand detection requires a database — defaulting to 'unknown'.")
                 self.brand = "unknown"
@@ -61,8 +87,10 @@ class Emulator:
 
         # Set after extraction
         self.db_id: int | None = None
+        self._dbPending: dict[str, str] = {}
         self.kernelPath = None
         self.filesystemPath = None
+        self.rootfsSize: int | None = None  # bytes of regular files in the rootfs tarball
 
         self.architecture = Architecture.UNKNOWN
         self.endianess    = Endianess.UNKNOWN
@@ -78,22 +106,20 @@ class Emulator:
           
     def createDirectories(self):
         # Create necessary directories for images and scratch space
-        if not os.path.exists(self.imagePath):
-            try:
-                os.makedirs(self.imagePath)
-                logger.info(f"Image directory created at: {self.imagePath}")
-            except Exception as e:
-                logger.error(f"Failed to create image directory: {e}")
-                raise
-            
-        if not os.path.exists(self.workDir):
-            try:
-                os.makedirs(self.workDir)
-                logger.info(f"Work directory created at: {self.workDir}")
-            except Exception as e:
-                logger.error(f"Failed to create work directory: {e}")
-                raise
+        try:
+            os.makedirs(self.imagePath, exist_ok=True)
+            os.makedirs(self.workDir, exist_ok=True)
+        except OSError as e:
+            logger.error("Failed to create output directories: %s", e)
+            raise
             
+    def _rawImageSize(self) -> int:
+        """Size of the guest disk: 1 GiB, or more when the root filesystem would not fit comfortably."""
+        needed = int(self.rootfsSize * 1.3) + 256 * MEGA
+        # The image is sparse, so the 1 GiB floor only costs disk space once the guest uses it
+        size = max(1 * GIGA, needed)
+        return -(-size // (64 * MEGA)) * 64 * MEGA
+
     def getWorkDir(self) -> str:
         path = os.path.join(self.workDir, self.tag)
         os.makedirs(path, exist_ok=True)
@@ -104,20 +130,18 @@ class Emulator:
             logger.error("Filesystem path is not set. Cannot extract filesystem.")
             return False
         
-        if not os.path.exists(dst):
-            try:
-                os.makedirs(dst)
-                logger.info(f"Destination directory created at: {dst}")
-            except Exception as e:
-                logger.error(f"Failed to create destination directory: {e}")
-                return False
+        try:
+            os.makedirs(dst, exist_ok=True)
+        except OSError as e:
+            logger.error("Failed to create destination directory: %s", e)
+            return False
         
         try:
-            shutil.unpack_archive(self.filesystemPath, dst)
-            logger.info(f"Filesystem extracted from {self.filesystemPath} to {dst}")
+            unpackArchive(self.filesystemPath, dst)
+            logger.info("Filesystem extracted from %s to %s", self.filesystemPath, dst)
             return True
         except Exception as e:
-            logger.error(f"Failed to extract filesystem: {e}")
+            logger.error("Failed to extract filesystem: %s", e)
             return False
     
     def _logAccessInfo(self, findings: dict) -> None:
@@ -135,10 +159,10 @@ class Emulator:
                 for port in sorted(webPorts):
                     scheme = "https" if port in (443, 8443) else "http"
                     suffix = f":{port}" if port not in (80, 443) else ""
-                    logger.info(f"  Web UI → {scheme}://{ip}{suffix}/")
+                    logger.info("  Web UI → %s://%s%s/", scheme, ip, suffix)
         else:
             for ip in baseIps:
-                logger.info(f"  Web UI → http://{ip}/  (no web port detected — try manually)")
+                logger.info("  Web UI → http://%s/  (no web port detected — try manually)", ip)
                 
     def _runQemu(self, qemu: Qemu, initArg: str, logPath: str,
                  networkResult: NetworkResult, timeout: int) -> None:
@@ -184,18 +208,42 @@ class Emulator:
             return False
 
         logger.info("Dumping filesystem objects to database.")
-        fileInfo = getFilesInfo(self.filesystemPath)
-        objectIds, _ = getObjectIds(fileInfo, self.config.sqlIP, self.config.sqlPort)
-        insertObjectsToImage(str(self.db_id), objectIds, fileInfo, self.config.sqlIP, self.config.sqlPort)
-
-        linkInfo = getLinksInfo(self.filesystemPath)
-        insertLinksToImage(str(self.db_id), linkInfo, self.config.sqlIP, self.config.sqlPort)
+        fileInfo, linkInfo = getTarballInfo(self.filesystemPath)
+        # One connection and one commit for the lookups and all the inserts
+        try:
+            with dbSession(self.config.sqlIP, self.config.sqlPort):
+                objectIds, _ = getObjectIds(fileInfo, self.config.sqlIP, self.config.sqlPort)
+                insertObjectsToImage(str(self.db_id), objectIds, fileInfo, self.config.sqlIP, self.config.sqlPort)
+                insertLinksToImage(str(self.db_id), linkInfo, self.config.sqlIP, self.config.sqlPort)
+        except Exception as e:
+            # Includes failing to open the session; the transaction has been rolled back
+            logger.error("Database session for the object dump failed: %s", e)
+            return False
         return True
             
-    def _updateDbField(self, field: str, value: str) -> bool:
+    def _dbDumpFailed(self, dbDump: Future | None) -> bool:
+        """Wait for a background dumpObjectsToDB() and record the failure if it did not succeed."""
+        if dbDump is None or dbDump.result():
+            return False
+        logger.error("Failed to dump objects to database.")
+        self._exportFindings("db_dump_failed")
+        return True
+
+    def _updateDbField(self, field: str, value: str) -> None:
+        # Queued and written by _flushDbFields, so one run issues a single UPDATE
+        if not self.config.sqlIP or not self.db_id:
+            return
+        self._dbPending[field] = value
+
+    def _flushDbFields(self) -> bool:
+        if not self._dbPending:
+            return True
         if not self.config.sqlIP or not self.db_id:
+            self._dbPending.clear()
             return True
-        return updateImageField(self.db_id, field, value, self.config.sqlIP, self.config.sqlPort)
+        ok = updateImageFields(self.db_id, self._dbPending, self.config.sqlIP, self.config.sqlPort)
+        self._dbPending.clear()
+        return ok
     
     def registerBrandInDB(self) -> int | None:
         if not self.config.sqlIP:
@@ -206,18 +254,26 @@ class Emulator:
         if not self.config.sqlIP:
             return False
         if not self.db_id:
-            brandId = self.registerBrandInDB()
-            if brandId is None:
-                logger.error("Failed to register brand in database.")
+            try:
+                with dbSession(self.config.sqlIP, self.config.sqlPort):
+                    brandId = self.registerBrandInDB()
+                    if brandId is None:
+                        logger.error("Failed to register brand in database.")
+                        return False
+                    self.db_id = upsertImage(
+                        self.tag,
+                        os.path.basename(self.config.firmwarePath),
+                        self.tag,
+                        brandId,
+                        self.config.sqlIP,
+                        self.config.sqlPort,
+                    )
+            except Exception as e:
+                # Opening the session connects, so an unreachable database surfaces here;
+                # the caller then carries on without the database
+                logger.error("Database session for registering the image failed: %s", e)
+                self.db_id = None
                 return False
-            self.db_id = upsertImage(
-                self.tag,
-                os.path.basename(self.config.firmwarePath),
-                self.tag,
-                brandId,
-                self.config.sqlIP,
-                self.config.sqlPort,
-            )
         return True if self.db_id else False
     
 # ------------------------------------------------------------------
@@ -237,6 +293,7 @@ class Emulator:
                                  probeResult, kernelPath, foundServices,
                                  extractionSeconds, preEmulationSeconds)
         saveFindings(findings, workDir)
+        self._flushDbFields()
         saveFindingsToDB(findings, self.config.sqlIP, self.config.sqlPort, self.db_id)
         return findings
 
@@ -248,8 +305,9 @@ class Emulator:
             return None
         if findings.get("stage") != "success":
             logger.error(
-                f"Cannot boot — findings stage is '{findings.get('stage', 'unknown')}', "
-                f"not 'success'. Run in check mode first."
+                "Cannot boot — findings stage is '%s', "
+                "not 'success'. Run in check mode first.",
+                findings.get('stage', 'unknown'),
             )
             return None
         return findings
@@ -271,7 +329,7 @@ class Emulator:
         with mountedImage(imagePath, mountPoint) as mp:
             hostPath = mp + guestFile
             if not os.path.exists(hostPath):
-                logger.error(f"Cannot re-inject: {hostPath} not found in image")
+                logger.error("Cannot re-inject: %s not found in image", hostPath)
                 return False
             with open(hostPath, "r", errors="replace") as f:
                 current = f.read()
@@ -280,44 +338,128 @@ class Emulator:
                 return True
             with open(hostPath, "w") as f:
                 f.write(content)
-            logger.info(f"Re-applied injection to {guestFile}")
+            logger.info("Re-applied injection to %s", guestFile)
         return True
     
 # ------------------------------------------------------------------
 # Extraction and Info Collection
 # ------------------------------------------------------------------
 
+    def _manifestPath(self) -> str:
+        return os.path.join(self.imagePath, f"{self.tag}.json")
+
+    def _saveManifest(self) -> None:
+        """Record what extract() and collectInfo() found, so later runs on the same firmware can skip them."""
+        manifest = {
+            "rootfsPath": self.filesystemPath,
+            "kernelPath": self.kernelPath,
+            "architecture": self.architecture.name,
+            "endianess": self.endianess.name,
+            "rootfsSize": self.rootfsSize,
+            "kernelVersion": self.kernelVersion,
+            "kernelVersionString": self.kernelVersionString,
+            "inferredKernelInit": self.inferredKernelInit,
+            "inferredKernelInitStrings": self.inferredKernelInitStrings,
+        }
+        path = self._manifestPath()
+        try:
+            # Written aside and renamed so an interrupted run never leaves a truncated manifest
+            with open(path + ".tmp", "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning("Failed to write extraction manifest %s: %s", path, e)
+
+    def _loadManifest(self) -> bool:
+        """Restore the results of an earlier extract()/collectInfo() run. Returns False if there are none usable."""
+        path = self._manifestPath()
+        if not os.path.isfile(path):
+            return False
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+            rootfsPath = manifest["rootfsPath"]
+            kernelPath = manifest["kernelPath"]
+            architecture = Architecture[manifest["architecture"]]
+            endianess = Endianess[manifest["endianess"]]
+            rootfsSize = manifest["rootfsSize"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable extraction manifest %s: %s", path, e)
+            return False
+
+        if not isinstance(rootfsSize, int) or isinstance(rootfsSize, bool):
+            logger.info("Extraction manifest %s has no root filesystem size, extracting again.", path)
+            return False
+
+        if not rootfsPath or not os.path.exists(rootfsPath) or (kernelPath and not os.path.exists(kernelPath)):
+            logger.info("Extraction manifest %s points to missing files, extracting again.", path)
+            return False
+
+        self.filesystemPath = rootfsPath
+        self.kernelPath = kernelPath
+        self.architecture = architecture
+        self.endianess = endianess
+        self.rootfsSize = rootfsSize
+        self.kernelVersion = manifest.get("kernelVersion", "")
+        self.kernelVersionString = manifest.get("kernelVersionString", "")
+        self.inferredKernelInit = manifest.get("inferredKernelInit", [])
+        self.inferredKernelInitStrings = manifest.get("inferredKernelInitStrings", [])
+
+        # The image row may be new (e.g. the database was added after the first run)
+        self._updateDbField("rootfs_extracted", "true")
+        self._updateDbField("kernel_extracted", "true" if self.kernelPath else "false")
+        self._updateDbField("arch", str(self.architecture) + str(self.endianess))
+        if self.kernelVersion:
+            self._updateDbField("kernel_version", self.kernelVersion)
+        self._flushDbFields()
+        return True
+
+    def _runExtractor(self) -> tuple[dict, dict]:
+        """
+        Run the extractor and return the (rootfs, kernel) results. By default a single run carves
+        both; otherwise a rootfs pass and a kernel pass run, concurrently unless disabled in the config.
+        """
+        if self.config.singlePassExtract:
+            result = extract(self.config.firmwarePath, self.imagePath)[0]
+            return result, result
+
+        fsPass = partial(extract, self.config.firmwarePath, self.imagePath, kernel=False)
+        kernelPass = partial(extract, self.config.firmwarePath, self.imagePath, filesystem=False)
+
+        if not self.config.parallelExtract:
+            return fsPass()[0], kernelPass()[0]
+
+        # Both passes are dominated by file IO and external tools, so threads overlap well
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            fsFuture = pool.submit(fsPass)
+            kernelFuture = pool.submit(kernelPass)
+            return fsFuture.result()[0], kernelFuture.result()[0]
+
     def extract(self) -> bool:
-        logger.info(f"Extracting firmware image: {self.config.firmwarePath}")
+        logger.info("Extracting firmware image: %s", self.config.firmwarePath)
 
-        result = extract(self.config.firmwarePath, self.imagePath, kernel=False)[0]
-        # Check that extraction actually happend
-        if not os.path.exists(str(result["rootfsPath"])):
-            result["status"] = False
-            
-        
-        if not result["status"]:
-            logger.error(f"Failed to extract filesystem from {self.config.firmwarePath}")
-            if self.config.sqlIP and self.db_id:
-                updateImageField(self.db_id, "rootfs_extracted", "false", self.config.sqlIP, self.config.sqlPort)
+        result, kernelResult = self._runExtractor()
+
+        # The extractor may report success without a rootfs (or with a path that was
+        # never written), so check it explicitly instead of stringifying a None
+        rootfsPath = result.get("rootfsPath")
+        if not result["status"] or rootfsPath is None or not os.path.exists(rootfsPath):
+            logger.error("Failed to extract filesystem from %s", self.config.firmwarePath)
+            self._updateDbField("rootfs_extracted", "false")
             return False
+
+        self._updateDbField("rootfs_extracted", "true")
+        self.filesystemPath = os.fspath(rootfsPath)
+        logger.info("Root filesystem extracted to: %s", self.filesystemPath)
+
+        kernelPath = kernelResult.get("kernelPath")
+        if not kernelResult["status"] or kernelPath is None:
+            logger.warning("Failed to extract kernel from %s", self.config.firmwarePath)
+            self._updateDbField("kernel_extracted", "false")
         else:
-            if self.config.sqlIP and self.db_id:
-                updateImageField(self.db_id, "rootfs_extracted", "true", self.config.sqlIP, self.config.sqlPort)
-                
-        self.filesystemPath = str(result["rootfsPath"])
-        logger.info(f"Root filesystem extracted to: {self.filesystemPath}")
-
-        result = extract(self.config.firmwarePath, self.imagePath, filesystem=False)[0]
-        if not result["status"]:
-            logger.warning(f"Failed to extract kernel from {self.config.firmwarePath}")
-            if self.config.sqlIP and self.db_id:
-                updateImageField(self.db_id, "kernel_extracted", "false", self.config.sqlIP, self.config.sqlPort)
-        else:            
-            self.kernelPath = str(result["kernelPath"])
-            if self.config.sqlIP and self.db_id:
-                updateImageField(self.db_id, "kernel_extracted", "true", self.config.sqlIP, self.config.sqlPort)
-            logger.info(f"Kernel extracted to: {self.kernelPath}")
+            self.kernelPath = os.fspath(kernelPath)
+            self._updateDbField("kernel_extracted", "true")
+            logger.info("Kernel extracted to: %s", self.kernelPath)
 
         return True
     
@@ -327,7 +469,7 @@ class Emulator:
             return False
 
         try:
-            self.architecture, self.endianess = checkArch(self.filesystemPath, self.tag)
+            self.architecture, self.endianess, self.rootfsSize = checkArch(self.filesystemPath, self.tag)
         except Exception:
             logger.error("Could not infer architecture")
             return False
@@ -337,34 +479,32 @@ class Emulator:
             return False
 
         self._updateDbField("arch", str(self.architecture) + str(self.endianess))
-        logger.info(f"Architecture: {self.architecture}, Endianness: {self.endianess}")
+        logger.info("Architecture: %s, Endianness: %s", self.architecture, self.endianess)
         return True
     
     def inferKernelInfo(self):
         # Infer the kernel info from the kernel image
-        logger.info(f"Inferring kernel info for firmware: {self.config.firmwarePath}")
+        logger.info("Inferring kernel info for firmware: %s", self.config.firmwarePath)
         
         if not self.kernelPath:
             logger.error("Kernel path is not set. Cannot infer kernel version.")
             return False
         
-        for string in strings(self.kernelPath, minLength=4):
-            if "Linux version" in string:
-                temp = string.split("Linux version ")[1].split(" ")[0]
-                if temp:
-                    if self.kernelVersion and self.kernelVersion != temp:
-                        logger.warning(f"Multiple kernel version strings found: {self.kernelVersion} and {temp}. Using the first one.")
-                        continue
-                    
-                    self.kernelVersion = temp
-                    self.kernelVersionString = string
-                    logger.debug(f"Found kernel version: {self.kernelVersion}")
-            elif "init=" in string:
-                temp = string.split("init=")[1].split(" ")[0]
-                if temp:
-                    self.inferredKernelInit.append(temp)
-                    self.inferredKernelInitStrings.append(string)
-                    logger.debug(f"Found kernel init command: {temp}")
+        for marker, temp, string in findTaggedStrings(self.kernelPath, _KERNEL_MARKERS_RE, _KERNEL_MARKERS):
+            if not temp:
+                continue
+            if marker == "version":
+                if self.kernelVersion and self.kernelVersion != temp:
+                    logger.warning("Multiple kernel version strings found: %s and %s. Using the first one.", self.kernelVersion, temp)
+                    continue
+
+                self.kernelVersion = temp
+                self.kernelVersionString = string
+                logger.debug("Found kernel version: %s", self.kernelVersion)
+            else:
+                self.inferredKernelInit.append(temp)
+                self.inferredKernelInitStrings.append(string)
+                logger.debug("Found kernel init command: %s", temp)
 
         if not self.kernelVersion:
             logger.warning("Kernel version could not be inferred from the kernel image.")
@@ -375,29 +515,33 @@ class Emulator:
         return True
 
     def collectInfo(self):
-        logger.info(f"Collecting information for firmware: {self.config.firmwarePath}")
+        logger.info("Collecting information for firmware: %s", self.config.firmwarePath)
 
         if not self.filesystemPath:
             logger.error("Extraction must be run before collecting information.")
             return False
 
-        # Check architecture and endianess
-        if not self.inferArchitecture():
-            logger.error("Failed to infer architecture.")
-            return False
-        
-        if self.kernelPath:
-            if not self.inferKernelInfo():
-                logger.warning("Failed to infer kernel info.")
+        try:
+            # Check architecture and endianess
+            if not self.inferArchitecture():
+                logger.error("Failed to infer architecture.")
+                return False
+            
+            if self.kernelPath:
+                if not self.inferKernelInfo():
+                    logger.warning("Failed to infer kernel info.")
 
-        return True
+            return True
+        finally:
+            # One UPDATE for everything extract() and the infer steps recorded
+            self._flushDbFields()
 
     # ------------------------------------------------------------------
     # Modes
     # ------------------------------------------------------------------
 
     def explore(self) -> dict | None:
-        logger.info(f"Running emulator for firmware: {self.config.firmwarePath}")
+        logger.info("Running emulator for firmware: %s", self.config.firmwarePath)
         
         # Register image to DB
         if self.config.sqlIP:
@@ -407,29 +551,35 @@ class Emulator:
         else:
             logger.info("No database configured, skipping image registration. No further DB updates will be possible for this firmware.")
 
-        logger.info(f"Step 1: Extracting firmware image {self.config.firmwarePath}")
+        logger.info("Step 1: Extracting firmware image %s", self.config.firmwarePath)
         _t0 = monotonic()
-        if not self.extract():
-            logger.error("Extraction failed, aborting emulator run.")
-            self._exportFindings("extraction_failed")
-            return
-
-        if not self.collectInfo():
-            logger.error("Failed to collect information, aborting emulator run.")
-            self._exportFindings("collect_info_failed")
-            return
+        if self._loadManifest():
+            logger.info("Reusing earlier extraction results from %s", self._manifestPath())
+        else:
+            if not self.extract():
+                logger.error("Extraction failed, aborting emulator run.")
+                self._exportFindings("extraction_failed")
+                return
+
+            if not self.collectInfo():
+                logger.error("Failed to collect information, aborting emulator run.")
+                self._exportFindings("collect_info_failed")
+                return
+            self._saveManifest()
         extractionSeconds = monotonic() - _t0
 
         if not checkCompatibility(self.architecture, self.endianess):
-            logger.error(f"Incompatible architecture or endianess: {self.architecture}, {self.endianess}")
+            logger.error("Incompatible architecture or endianess: %s, %s", self.architecture, self.endianess)
             self._exportFindings("incompatible_arch")
             return
 
+        # The object dump is network-bound and independent of the raw image, so it runs in the
+        # background while step 2 creates the image, and is joined before the image is filled
+        dbDump = None
         if self.config.sqlIP :
-            if not self.dumpObjectsToDB():
-                logger.error("Failed to dump objects to database.")
-                self._exportFindings("db_dump_failed")
-                return None
+            dbPool = ThreadPoolExecutor(max_workers=1)
+            dbDump = dbPool.submit(self.dumpObjectsToDB)
+            dbPool.shutdown(wait=False)
 
         logger.info("Step 2: preparing image for emulation")
 
@@ -440,8 +590,10 @@ class Emulator:
             with open(findingsPath) as f:
                 existing = json.load(f)
             stage = existing.get("stage", "unknown")
-            logger.warning(f"Existing findings found at {findingsPath} with stage '{stage}'")
+            logger.warning("Existing findings found at %s with stage '%s'", findingsPath, stage)
             if stage == "success":
+                if self._dbDumpFailed(dbDump):
+                    return None
                 logger.warning("Previous run was successful — reusing findings and skipping preparation.")
                 return existing
             else:
@@ -450,9 +602,12 @@ class Emulator:
     
         self._cleanupWorkDir()
 
-        createRawImg(os.path.join(workDir, "raw.img"), 1 * GIGA)
+        createRawImg(os.path.join(workDir, "raw.img"), self._rawImageSize())
         os.makedirs(os.path.join(workDir, "mnt"), exist_ok=True)
 
+        if self._dbDumpFailed(dbDump):
+            return None
+
         with mountedImage(os.path.join(workDir, "raw.img"), os.path.join(workDir, "mnt")) as mp:
             self.extractFs(mp)
 
@@ -473,7 +628,7 @@ class Emulator:
 
         foundInits, foundServices = res
 
-        logger.info(f"Step 3: probing emulation with {len(foundInits)} init candidates and {len(foundServices)} found services")
+        logger.info("Step 3: probing emulation with %d init candidates and %d found services", len(foundInits), len(foundServices))
 
         pre = PreEmulator(
             os.path.join(workDir, "raw.img"),
@@ -499,15 +654,14 @@ class Emulator:
 
         nr = probeResult.networkResult
         logger.info(
-            f"Network ready: type={nr.networkType} "
-            f"bridge={nr.netBridge} iface={nr.netInterface} "
-            f"userNet={nr.isUserNetwork} "
-            f"ping={probeResult.pingReachable} service={probeResult.serviceReachable}"
+            "Network ready: type=%s bridge=%s iface=%s userNet=%s ping=%s service=%s",
+            nr.networkType, nr.netBridge, nr.netInterface, nr.isUserNetwork,
+            probeResult.pingReachable, probeResult.serviceReachable,
         )
         if nr.hostIps:
-            logger.info(f"Host IPs: {', '.join(nr.hostIps)}")
+            logger.info("Host IPs: %s", ', '.join(nr.hostIps))
 
-        logger.info(f"Step 4: exporting findings")
+        logger.info("Step 4: exporting findings")
 
         status = "success" if probeResult.serviceReachable else "partial_success"
 
@@ -530,7 +684,7 @@ class Emulator:
             return
         logPath = os.path.join(workDir, "qemu.boot.serial.log")
         self._logAccessInfo(findings)
-        logger.info(f"Booting firmware")
+        logger.info("Booting firmware")
         self._runQemu(qemu, initArg, logPath, networkResult, timeout=86400)
 
     def debug(self) -> None:
@@ -545,7 +699,7 @@ class Emulator:
             return
         logPath = os.path.join(workDir, "qemu.debug.serial.log")
         self._logAccessInfo(findings)
-        logger.info(f"Booting firmware in debug mode (nc:31337, telnet:31338)")
+        logger.info("Booting firmware in debug mode (nc:31337, telnet:31338)")
         self._runQemu(qemu, initArg, logPath, networkResult, timeout=86400)
 
     def analyze(self) -> None:
@@ -554,9 +708,9 @@ class Emulator:
             return
         fw  = findings["firmware"]
         net = findings["network"]
-        logger.info(f"Firmware : {fw['path']}  iid={fw['iid']}  brand={fw['brand']}")
-        logger.info(f"Network  : type={net['networkType']}  userNet={net['isUserNetwork']}")
-        logger.info(f"IPs      : {[c['ip'] for c in net['candidates']]}")
-        logger.info(f"Ports    : {net['ports']}")
+        logger.info("Firmware : %s  iid=%s  brand=%s", fw['path'], fw['iid'], fw['brand'])
+        logger.info("Network  : type=%s  userNet=%s", net['networkType'], net['isUserNetwork'])
+        logger.info("IPs      : %s", [c['ip'] for c in net['candidates']])
+        logger.info("Ports    : %s", net['ports'])
         logger.info("Full analysis tooling not yet implemented")
 
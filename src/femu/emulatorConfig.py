@@ -1,8 +1,7 @@
+import importlib.util
 import logging
 import os
 
-from .dbInterface import checkConnection
-
 # Use the root logger, do not set up a separate logger or handler here.
 logger = logging.getLogger(__name__)
 
@@ -11,6 +10,9 @@ _PKG_DIR = os.path.dirname(os.path.abspath(__file__))
 _DEFAULT_BINARIES = "./binaries"                        # resolved at runtime from CWD
 _DEFAULT_SCRIPTS  = os.path.join(_PKG_DIR, "scripts")  # bundled inside the package
 
+# Firmware fingerprint algorithms; all give a fixed-length hex digest (unlike hashlib's shake_*)
+_HASH_ALGORITHMS = ("sha256", "md5", "blake2b", "blake3")
+
 class emulatorConfig:
     def __init__(self,
     firmwarePath: str,
@@ -21,6 +23,9 @@ class emulatorConfig:
     sqlIP: str | None = None,
     sqlPort: int = 5432,
     debug: bool = False,
+    singlePassExtract: bool = True,
+    parallelExtract: bool = True,
+    hashAlgorithm: str = "sha256",
     ):
         self.firmwarePath: str = firmwarePath
         self.outputPath: str = outputPath
@@ -30,12 +35,15 @@ class emulatorConfig:
         self.sqlIP: str | None = sqlIP
         self.sqlPort: int = sqlPort
         self.debug: bool = debug
+        self.singlePassExtract: bool = singlePassExtract  # carve the rootfs and kernel in one extractor run
+        self.parallelExtract: bool = parallelExtract  # with two passes, run the rootfs and kernel passes concurrently
+        self.hashAlgorithm: str = hashAlgorithm  # firmware fingerprint; changing it changes tags and DB image hashes
         
-        # Normalise all paths to absolute
-        self.firmwarePath  = os.path.abspath(firmwarePath)
-        self.outputPath    = os.path.abspath(outputPath)
-        self.scriptsPath   = os.path.abspath(scriptsPath)
-        self.binariesPath  = os.path.abspath(binariesPath)
+        # Normalise all paths to absolute, expanding a leading ~
+        self.firmwarePath  = os.path.abspath(os.path.expanduser(firmwarePath))
+        self.outputPath    = os.path.abspath(os.path.expanduser(outputPath))
+        self.scriptsPath   = os.path.abspath(os.path.expanduser(scriptsPath))
+        self.binariesPath  = os.path.abspath(os.path.expanduser(binariesPath))
         
         if not os.path.isdir(self.binariesPath) or not os.listdir(self.binariesPath):
             raise FileNotFoundError(
@@ -48,12 +56,16 @@ class emulatorConfig:
                 f"  femu --binaries <path> ...\n"
             )
 
+        if self.hashAlgorithm not in _HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {self.hashAlgorithm} (choose from {', '.join(_HASH_ALGORITHMS)})")
+        if self.hashAlgorithm == "blake3" and importlib.util.find_spec("blake3") is None:
+            raise ValueError("The blake3 hash algorithm requires the 'blake3' package (pip install femu[blake3]).")
+
         if self.sqlIP is None or self.sqlIP == "":
             logger.warning("No PostgreSQL IP provided. Some features may not work.")
             self.sqlIP = None
-            
-        if self.sqlIP is not None:
-            if not checkConnection(self.sqlIP, self.sqlPort):
-                logger.error("Failed to connect to PostgreSQL database.")
-                raise ConnectionError("Could not connect to PostgreSQL database.")
+
+        # The database is not contacted here: the CLI checks the login once with checkAuth, the
+        # connection pool is opened on first use, and Emulator.explore stops using the database
+        # for a firmware if its registration session cannot be opened
 
@@ -1,8 +1,26 @@
+import functools
 import logging
 import os
+import stat
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Same limit as the kernel's MAXSYMLINKS; longer chains fail with ELOOP there too
+MAX_SYMLINK_HOPS = 40
+
+# Threads chmod-ing separate top-level subtrees in recursiveGuestChmod
+_CHMOD_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# lstat results memoized inside a guestStatCache() block, per thread; None marks a missing path
+_statCache = threading.local()
+
+# Image roots are opened as bare path handles: enough to resolve names against, nothing is read
+_ROOT_FD_FLAGS = os.O_DIRECTORY | getattr(os, "O_PATH", os.O_RDONLY)
+
 def hostToGuestPath(imagePath: str, path: str) -> str:
     """
     Fixes the root of a path by replacing the host root with the image path.
@@ -18,15 +36,33 @@ def hostToGuestPath(imagePath: str, path: str) -> str:
         ValueError: If the imagePath does not start with '/'.
     """
     
-    if not imagePath.startswith("/") or not path.startswith("/"):
+    if not path.startswith("/"):
         logger.error(f"Root path {imagePath} or path {path} does not start with '/'.")
         raise ValueError(f"Root path {imagePath} or path {path} does not start with '/'.")
     
-    if not imagePath.endswith("/"):
-        imagePath = imagePath + "/"
-    
-    fixedPath = path.replace(imagePath, "/", 1)
-    return fixedPath
+    # Splice off the known-length prefix instead of searching the path for it
+    root = _imageRoot(imagePath)
+    if not _isHostPath(root, path):
+        return path
+    return path[len(root):] or "/"
+
+@functools.lru_cache(maxsize=64)
+def _imageRoot(imagePath: str) -> str:
+    """
+    Validates imagePath and returns it without trailing '/'. The helpers below are called
+    thousands of times per image with the same few roots, so this is worked out once per root.
+    """
+    if not imagePath.startswith("/"):
+        logger.error(f"Root path {imagePath} does not start with '/'.")
+        raise ValueError(f"Root path {imagePath} does not start with '/'.")
+    return imagePath.rstrip("/")
+
+def _isHostPath(root: str, path: str) -> bool:
+    """
+    True if path is root itself or lies below it. root must not end with '/'. A bare
+    startswith would also accept siblings such as /mnt/img2 for /mnt/img.
+    """
+    return path.startswith(root) and (len(path) == len(root) or path[len(root)] == "/")
 
 def guestToHostPath(imagePath: str, path: str) -> str:
     """
@@ -42,11 +78,7 @@ def guestToHostPath(imagePath: str, path: str) -> str:
     Raises:
         ValueError: If the imagePath does not start with '/'.
     """
-    if not imagePath.startswith("/"):
-        logger.error(f"Root path {imagePath} does not start with '/'.")
-        raise ValueError(f"Root path {imagePath} does not start with '/'.")
-
-    return os.path.join(imagePath, path.lstrip("/"))
+    return _imageRoot(imagePath) + "/" + path.lstrip("/")
 
 def resolveGuestPath(imagePath: str, path: str) -> str:
     """
@@ -62,20 +94,154 @@ def resolveGuestPath(imagePath: str, path: str) -> str:
     Returns:
         str: The resolved path.
     """
-    if not path.startswith(imagePath):
+    return _resolveGuestStat(imagePath, path)[0]
+
+@contextmanager
+def guestStatCache():
+    """
+    Memoizes the lstat and readlink calls made by the guest path predicates, and whole
+    readGuestLink results, for the duration of the block, so repeated lookups of the same
+    paths hit the filesystem once. Lookups that do reach the filesystem are made relative
+    to a descriptor of the image root held open for the block.
+
+    There is no expiry: only wrap code that does not modify the guest filesystem, or call
+    invalidateGuestStat for every path it creates, removes or replaces. Nested blocks share
+    the outermost cache. The cache is per thread.
+    """
+    if getattr(_statCache, "entries", None) is not None:
+        yield
+        return
+    _statCache.entries = {}
+    _statCache.links = {}
+    _statCache.resolved = {}
+    _statCache.rootFds = {}
+    try:
+        yield
+    finally:
+        for fd in _statCache.rootFds.values():
+            os.close(fd)
+        _statCache.entries = _statCache.links = _statCache.resolved = _statCache.rootFds = None
+
+def invalidateGuestStat(path: str | None = None) -> None:
+    """
+    Drops the cached lstat and link target of a host path, or the whole cache if no path is
+    given. Memoized readGuestLink results may pass through any path, so they are always dropped.
+    Does nothing outside a guestStatCache() block.
+    """
+    entries = getattr(_statCache, "entries", None)
+    if entries is None:
+        return
+    _statCache.resolved.clear()
+    if path is None:
+        entries.clear()
+        _statCache.links.clear()
+    else:
+        entries.pop(path, None)
+        _statCache.links.pop(path, None)
+
+def _rootRelative(path: str, root: str | None) -> tuple[str, int | None]:
+    """
+    Splits a host path under root into (path relative to root, descriptor of root), so the
+    kernel resolves only the guest part of the path (fstatat/readlinkat) instead of walking
+    the host components of root on every call. Returns (path, None) outside a
+    guestStatCache() block or when path is not under root.
+    """
+    fds = getattr(_statCache, "rootFds", None)
+    if fds is None or root is None or not _isHostPath(root, path):
+        return path, None
+    fd = fds.get(root)
+    if fd is None:
+        try:
+            fd = fds[root] = os.open(root or "/", _ROOT_FD_FLAGS)
+        except OSError:
+            return path, None
+    return path[len(root) + 1:] or ".", fd
+
+def _lstatOrNone(path: str, root: str | None = None) -> os.stat_result | None:
+    entries = getattr(_statCache, "entries", None)
+    if entries is not None and path in entries:
+        return entries[path]
+    try:
+        relPath, rootFd = _rootRelative(path, root)
+        st = os.stat(relPath, dir_fd=rootFd, follow_symlinks=False)
+    except (OSError, ValueError):
+        st = None
+    if entries is not None:
+        entries[path] = st
+    return st
+
+def _readlinkOrNone(path: str, root: str | None = None) -> str | None:
+    """
+    Target of the symlink at path, or None if path is not a symlink or does not exist.
+    One readlink answers both "is it a link?" and "where does it point?".
+    """
+    links = getattr(_statCache, "links", None)
+    if links is not None and path in links:
+        return links[path]
+    try:
+        relPath, rootFd = _rootRelative(path, root)
+        target = os.readlink(relPath, dir_fd=rootFd)
+    except (OSError, ValueError):
+        target = None
+    if links is not None:
+        links[path] = target
+    return target
+
+def _resolveGuestStat(imagePath: str, path: str) -> tuple[str, os.stat_result | None]:
+    """
+    resolveGuestPath, also returning the lstat of the resolved path (None if it does not exist).
+    Each hop costs one lstat, and callers inspect the final result instead of stat-ing again.
+    Like the kernel, a chain of more than MAX_SYMLINK_HOPS links, or one that loops back on
+    itself, does not resolve: the last link reached is returned with a None stat.
+    """
+    root = _imageRoot(imagePath)
+    if not _isHostPath(root, path):
         path = guestToHostPath(imagePath, path)
     
-    while os.path.islink(path):
-        linkTarget = os.readlink(path)
+    st = _lstatOrNone(path, root)
+    visited = set()
+    while st is not None and stat.S_ISLNK(st.st_mode):
+        if len(visited) >= MAX_SYMLINK_HOPS:
+            logger.warning("Too many symlink hops resolving %s", path)
+            return path, None
+        visited.add(path)
+
+        linkTarget = _readlinkOrNone(path, root)
+        if linkTarget is None:
+            # Replaced between the lstat and the readlink
+            return path, _lstatOrNone(path, root)
         if os.path.isabs(linkTarget):
             # Guest-absolute target → translate to the corresponding host path.
-            path = guestToHostPath(imagePath, linkTarget)
+            nextPath = guestToHostPath(imagePath, linkTarget)
         else:
             # Relative target resolves against the link's own (host) directory.
             # It is already a host path, so do NOT translate again — doing so
-            path = os.path.normpath(os.path.join(os.path.dirname(path), linkTarget))
+            # would prepend the image root a second time.
+            nextPath = os.path.normpath(os.path.join(os.path.dirname(path), linkTarget))
+        if nextPath in visited:
+            # Self-referential link (e.g. a -> a): no need to lstat it again
+            logger.warning("Symlink loop resolving %s", nextPath)
+            return nextPath, None
+        path = nextPath
+        st = _lstatOrNone(path, root)
 
-    return path
+    return path, st
+
+def statInGuest(imagePath: str, path: str) -> os.stat_result | None:
+    """
+    Stats a path in the guest filesystem.
+    If the path is a symlink, stats its target.
+
+    If the path does not start with the imagePath, it is assumed to be a guest path and thus corrected to the host path.
+
+    Args:
+        imagePath (str): The root path of the image.
+        path (str): The path to stat.
+
+    Returns:
+        os.stat_result | None: The stat of the resolved path, or None if it does not exist.
+    """
+    return _resolveGuestStat(imagePath, path)[1]
 
 def existsInGuest(imagePath:str, path: str) -> bool:
     """
@@ -90,12 +256,7 @@ def existsInGuest(imagePath:str, path: str) -> bool:
     Returns:
         bool: True if the path exists, False otherwise.
     """
-    if not path.startswith(imagePath):
-        path = guestToHostPath(imagePath, path)
-    
-    path = resolveGuestPath(imagePath, path)
-
-    return os.path.exists(path) 
+    return _resolveGuestStat(imagePath, path)[1] is not None
  
 
 def isFileInGuest(imagePath:str, path: str) -> bool:
@@ -112,13 +273,8 @@ def isFileInGuest(imagePath:str, path: str) -> bool:
     Returns:
         bool: True if the path is a file, False otherwise.
     """
-    
-    if not path.startswith(imagePath):
-        path = guestToHostPath(imagePath, path)
-    
-    path = resolveGuestPath(imagePath, path)
-    
-    return os.path.isfile(path)
+    st = _resolveGuestStat(imagePath, path)[1]
+    return st is not None and stat.S_ISREG(st.st_mode)
 
 def isDirInGuest(imagePath: str, path: str) -> bool:
     """
@@ -134,12 +290,8 @@ def isDirInGuest(imagePath: str, path: str) -> bool:
     Returns:
         bool: True if the path is a directory, False otherwise.
     """
-    if not path.startswith(imagePath):
-        path = guestToHostPath(imagePath, path)
-    
-    path = resolveGuestPath(imagePath, path)
-    
-    return os.path.isdir(path)
+    st = _resolveGuestStat(imagePath, path)[1]
+    return st is not None and stat.S_ISDIR(st.st_mode)
 
 def isFileInGuestNotEmpty(imagePath: str, path: str) -> bool:
     """
@@ -155,13 +307,8 @@ def isFileInGuestNotEmpty(imagePath: str, path: str) -> bool:
     Returns:
         bool: True if the file exists and is not empty, False otherwise.
     """
-    
-    if not path.startswith(imagePath):
-        path = guestToHostPath(imagePath, path)
-    
-    path = resolveGuestPath(imagePath, path)
-    
-    return os.path.isfile(path) and os.path.getsize(path) > 0
+    st = _resolveGuestStat(imagePath, path)[1]
+    return st is not None and stat.S_ISREG(st.st_mode) and st.st_size > 0
 
 def recursiveGuestChmod(path: str, mode: int, imagePath: str, addPerms = False) -> None:
     """
@@ -177,46 +324,99 @@ def recursiveGuestChmod(path: str, mode: int, imagePath: str, addPerms = False)
         addPerms (bool): If True, adds the permissions to the existing ones, otherwise replaces them.
     """
     
-    if imagePath and not path.startswith(imagePath):
+    if imagePath and not _isHostPath(_imageRoot(imagePath), path):
         path = guestToHostPath(imagePath, path)
-        
-    if not os.path.lexists(path):
-        logger.warning(f"Path {path} does not exist, skipping chmod.")
-        return
-            
+
     # Resolve target if path is a symlink
-    path = resolveGuestPath(imagePath, path)
-        
-    if not os.path.exists(path):
+    path, st = _resolveGuestStat(imagePath, path)
+
+    if st is None:
         logger.warning(f"Path {path} does not exist, skipping chmod.")
         return
     
-    def changePerms(path: str, mode: int, addPerms: bool) -> None:
-        if addPerms:
-            current_mode = os.stat(path).st_mode
-            os.chmod(path, current_mode | mode)
-        else:
-            os.chmod(path, mode)
-    
     # If the path is a file, change its permissions and return
-    if os.path.isfile(path):
-        changePerms(path, mode, addPerms)
+    if stat.S_ISREG(st.st_mode):
+        newMode = st.st_mode | mode if addPerms else mode
+        if stat.S_IMODE(st.st_mode) != stat.S_IMODE(newMode):
+            os.chmod(path, newMode)
         return
-            
-    for root, dirs, files in os.walk(path):
-        for d in dirs:
-            dirPath = os.path.join(root, d)
-            if os.path.islink(dirPath) :
-                continue
 
-            changePerms(dirPath, mode, addPerms)
+    if not stat.S_ISDIR(st.st_mode):
+        return
 
-        for f in files:
-            filePath = os.path.join(root, f)
-            if os.path.islink(filePath):
-                continue
+    try:
+        topFd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+
+    try:
+        try:
+            with os.scandir(topFd) as it:
+                entries = [entry for entry in it if not entry.is_symlink()]
+        except OSError:
+            return
+
+        subdirs = []
+        for entry in entries:
+            _chmodEntry(topFd, entry, mode, addPerms)
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
 
-            changePerms(filePath, mode, addPerms)
+        # Subtrees are independent and chmod/scandir release the GIL, so walk them in parallel
+        if len(subdirs) > 1:
+            with ThreadPoolExecutor(max_workers=min(_CHMOD_WORKERS, len(subdirs))) as pool:
+                for future in [pool.submit(_chmodTree, name, topFd, mode, addPerms) for name in subdirs]:
+                    future.result()
+        elif subdirs:
+            _chmodTree(subdirs[0], topFd, mode, addPerms)
+    finally:
+        os.close(topFd)
+
+def _chmodEntry(dirFd: int, entry: os.DirEntry, mode: int, addPerms: bool) -> None:
+    # fchmodat relative to the open parent: no full path lookup per entry
+    if not addPerms:
+        # Checking first would cost a stat to save a chmod; just set the mode
+        os.chmod(entry.name, mode, dir_fd=dirFd)
+        return
+    currentMode = entry.stat(follow_symlinks=False).st_mode
+    if currentMode & mode != mode:
+        os.chmod(entry.name, currentMode | mode, dir_fd=dirFd)
+
+def _chmodTree(name: str, parentFd: int, mode: int, addPerms: bool) -> None:
+    for dirFd, entry in _scanNoFollow(name, parentFd):
+        _chmodEntry(dirFd, entry, mode, addPerms)
+
+def _scanNoFollow(top: str, parentFd: int | None = None):
+    """
+    Yields (dirFd, entry) for every entry below top that is not a symlink, top-down, without
+    following symlinked directories. dirFd is an open descriptor of the entry's parent, valid
+    until the next item is requested, so callers can act on entry.name relative to it.
+    Entry types come from the directory read, so classifying costs no extra lstat.
+    A directory is yielded before it is opened, so the caller may fix its permissions first.
+    """
+    flags = os.O_RDONLY | os.O_DIRECTORY
+    if parentFd is not None:
+        flags |= os.O_NOFOLLOW
+    try:
+        dirFd = os.open(top, flags, dir_fd=parentFd)
+    except OSError:
+        return
+
+    try:
+        try:
+            with os.scandir(dirFd) as it:
+                entries = list(it)
+        except OSError:
+            return
+
+        for entry in entries:
+            if entry.is_symlink():
+                continue
+            yield dirFd, entry
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scanNoFollow(entry.name, dirFd)
+    finally:
+        os.close(dirFd)
 
 def readGuestLink(path: str, imagePath: str, translateToHost: bool = True) -> str:
     """
@@ -241,17 +441,23 @@ def readGuestLink(path: str, imagePath: str, translateToHost: bool = True) -> st
         imagePath = os.getcwd()
 
     # Accept either a host path or a guest path
-    if path.startswith(imagePath.rstrip("/")):
+    if _isHostPath(_imageRoot(imagePath), path):
         guestPath = hostToGuestPath(imagePath, path)
     else:
         guestPath = path if path.startswith("/") else "/" + path
 
+    memo = getattr(_statCache, "resolved", None)
+    key = (imagePath, guestPath)
+    if memo is not None and key in memo:
+        resolved = memo[key]
+        return guestToHostPath(imagePath, resolved) if translateToHost else resolved
+
     resolved = "/"
     # Components still to process. Symlink targets are expanded *back* onto this
     # queue so that any symlinked component they introduce is itself resolved
     # (e.g. /etc/passwd -> default/passwd where /etc/default -> /tmp/default).
     pending = [p for p in guestPath.strip("/").split("/") if p and p != "."]
-    maxHops = 40  # guard against symlink cycles
+    maxHops = MAX_SYMLINK_HOPS  # guard against symlink cycles
     while pending:
         part = pending.pop(0)
         if part == ".":
@@ -263,13 +469,13 @@ def readGuestLink(path: str, imagePath: str, translateToHost: bool = True) -> st
         candidate = os.path.join(resolved, part)
         hostCandidate = guestToHostPath(imagePath, candidate)
 
-        if os.path.islink(hostCandidate):
+        target = _readlinkOrNone(hostCandidate, _imageRoot(imagePath))
+        if target is not None:
             maxHops -= 1
             if maxHops < 0:
                 logger.warning(f"Too many symlink hops resolving {path}; stopping at {candidate}")
                 resolved = candidate
                 break
-            target = os.readlink(hostCandidate)
             targetParts = [p for p in target.split("/") if p and p != "."]
             if os.path.isabs(target):
                 # Guest-absolute target: restart from the guest root.
@@ -280,4 +486,6 @@ def readGuestLink(path: str, imagePath: str, translateToHost: bool = True) -> st
         else:
             resolved = candidate
 
+    if memo is not None:
+        memo[key] = resolved
     return guestToHostPath(imagePath, resolved) if translateToHost else resolved
\ No newline at end of file
@@ -50,7 +50,7 @@ def inferNvramDefaults(imagePath: str, mountPoint: str, probeLog: str, workDir:
     keys = _parseNvramKeys(probeLog)
 
     if len(keys) < _MIN_KEYS:
-        logger.debug(f"Only {len(keys)} NVRAM keys found — skipping defaults inference")
+        logger.debug("Only %d NVRAM keys found — skipping defaults inference", len(keys))
         return False
 
     logger.info(f"Inferring NVRAM defaults from {len(keys)} keys")
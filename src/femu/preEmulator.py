@@ -295,7 +295,7 @@ class PreEmulator:
 
     def getNetworkInfo(self, kernelLogPath: str) -> tuple[list, list]:
         """Parse a kernel log and return (ports, configCandidates)."""
-        logger.debug(f"Reading kernel log: {kernelLogPath}")
+        logger.debug("Reading kernel log: %s", kernelLogPath)
         # TODO: Consider using binary read
         with open(kernelLogPath, "r", errors="replace") as f:
             kernelLog = f.readlines()
@@ -356,7 +356,7 @@ class PreEmulator:
                 os.makedirs(os.path.dirname(path), exist_ok=True)
                 with open(path, "w") as f:
                     f.write(value)
-        logger.debug(f"Written network files: {config}")
+        logger.debug("Written network files: %s", config)
 
     def _restoreBackupIfNeeded(self) -> None:
         """Restore the injected init file. Called when an init attempt fails."""
@@ -364,7 +364,7 @@ class PreEmulator:
             with mountedImage(self.imagePath, self.mountPoint) as mp:
                 with open(guestToHostPath(mp, self.backupFile), "w") as f:
                     f.write(self.backupData)
-            logger.debug(f"Restored original init: {self.backupFile}")
+            logger.debug("Restored original init: %s", self.backupFile)
         self.backupFile = None
         self.backupData = None
 
@@ -428,8 +428,8 @@ class PreEmulator:
             # --- classify ---
             ports, candidates = self.getNetworkInfo(probeLog)
             for addr, iface, bridge, vlns, macs in candidates:
-                logger.debug(f"  candidate: iface={iface} addr={addr} bridge={bridge} "
-                             f"vlans={vlns} macs={macs}")
+                logger.debug("  candidate: iface=%s addr=%s bridge=%s vlans=%s macs=%s",
+                             iface, addr, bridge, vlns, macs)
 
             networkResult = classifyNetwork(candidates, ports)
             logger.info(
@@ -4,8 +4,11 @@ import shutil
 import stat
 import os
 import re
+import multiprocessing
 
-from .util import find, findDirs, strings, findStringInBinFile, mountedImage, runFsck
+from concurrent.futures import ProcessPoolExecutor
+
+from .util import find, findDirs, indexFiles, iterFiles, stringsStartingWith, findStringInBinFile, mountedImage, runFsck
 
 from .guestUtils import  (
     guestToHostPath, 
@@ -14,14 +17,24 @@ from .guestUtils import  (
     isFileInGuest,
     isDirInGuest,
     isFileInGuestNotEmpty,
+    statInGuest,
     recursiveGuestChmod,
-    readGuestLink
+    readGuestLink,
+    guestStatCache,
+    invalidateGuestStat
 )
 
 from .common import Architecture, Endianess
 
 logger = logging.getLogger(__name__)
 
+# Guest directories that hold the image's executables
+_EXECUTABLE_LOCATIONS = ("/bin", "/sbin", "/usr/bin", "/usr/sbin")
+
+# File names searched for as init candidates, in order of preference
+# FirmAE diff: Added rc and init for asus firmwares
+_INIT_NAMES = ("rcS", "preinit", "preinitMT", "init", "rc")
+
 def initFirmadyne(rootPath: str) -> None:
     """
     Initialize Firmadyne by creating necessary directories.
@@ -72,11 +85,12 @@ def validateInits(rootPath: str, suspectedInits: list[str]) -> list[str]:
     if existsInGuest(rootPath, "/init") and not isDirInGuest(rootPath, "/init"):
         possibleInits.append(hostToGuestPath(rootPath, "/init"))
 
-    # FirmAE diff: Added rc and init for asus firmwares
-    for possibleInit in ["rcS", "preinit", "preinitMT", "init", "rc"]:
-        results = find(rootPath, possibleInit)
+    # One walk of the image for all names, reported grouped by name as before
+    results = find(rootPath, list(_INIT_NAMES))
+    for possibleInit in _INIT_NAMES:
         for result in results:
-            possibleInits.append(hostToGuestPath(rootPath, result))
+            if os.path.basename(result) == possibleInit:
+                possibleInits.append(hostToGuestPath(rootPath, result))
 
     if len(possibleInits) == 0:
         logger.warning("No init commands found in the image. Using default preInit.sh.")
@@ -92,14 +106,28 @@ def validateInits(rootPath: str, suspectedInits: list[str]) -> list[str]:
             seen.add(init)
             uniqueInits.append(init)
     
+    def replaceLink(link: str, target: str) -> None:
+        # Only reached when the init is neither a file nor a directory, so whatever
+        # sits at `link` (usually a broken symlink) is replaced without re-checking it
+        try:
+            os.unlink(link)
+        except FileNotFoundError:
+            pass
+        os.symlink(hostToGuestPath(rootPath, target), link)
+        invalidateGuestStat(link)
+
     foundInits = []
+    possibleLocations = None
+    binIndex = None
     for init in uniqueInits:
         initHostPath = guestToHostPath(rootPath, init)
             
-        if isDirInGuest(rootPath, init):
+        # One resolution classifies the init instead of one per predicate
+        st = statInGuest(rootPath, init)
+        if st is not None and stat.S_ISDIR(st.st_mode):
             continue
 
-        if isFileInGuest(rootPath, init):
+        if st is not None and stat.S_ISREG(st.st_mode):
             foundInits.append(init)
             continue
             
@@ -109,41 +137,45 @@ def validateInits(rootPath: str, suspectedInits: list[str]) -> list[str]:
         # FIRMAE diff: resolve symlinks (e.g. /bin → /usr/bin) and deduplicate
         # before searching, to avoid searching the same directory twice and to
         # handle firmware where standard dirs are symlinks to merged paths.
-        seen_locs: set[str] = set()
-        possibleLocations = []
-        for loc in ["/bin", "/sbin", "/usr/bin", "/usr/sbin"]:
-            resolved = readGuestLink(guestToHostPath(rootPath, loc), rootPath)
-            if resolved not in seen_locs:
-                seen_locs.add(resolved)
-                possibleLocations.append(resolved)
-        results = find(possibleLocations, filename)
+        if possibleLocations is None:
+            seen_locs: set[str] = set()
+            possibleLocations = []
+            for loc in _EXECUTABLE_LOCATIONS:
+                resolved = readGuestLink(guestToHostPath(rootPath, loc), rootPath)
+                if resolved not in seen_locs:
+                    seen_locs.add(resolved)
+                    possibleLocations.append(resolved)
+        if binIndex is None:
+            # Walked once instead of once per lookup; rebuilt only after a symlink is added below
+            binIndex = indexFiles(possibleLocations)
+        results = binIndex.get(filename, [])
 
         if len(results) > 0:
             # Create a symlink to the first found result
             linkTarget = results[0]
-            if os.path.islink(initHostPath):
-                os.remove(initHostPath)
-                
-            os.symlink(hostToGuestPath(rootPath, linkTarget), initHostPath)
+            replaceLink(initHostPath, linkTarget)
+            binIndex = None
             foundInits.append(init)
-            logger.debug(f"Fixed file {init} by creating a symlink to {linkTarget}.")
+            logger.debug("Fixed file %s by creating a symlink to %s.", init, linkTarget)
             continue
         
         # FIRMAE diff
         # If the name of the file was not found, last resort to try to find the old target if it was a symlink
-        if os.path.islink(initHostPath):
+        try:
             linkTarget = os.readlink(initHostPath)
+        except OSError:
+            # Missing or not a symlink: nothing left to go on
+            linkTarget = None
+        if linkTarget is not None:
             filename = os.path.basename(linkTarget)
-            results = find(possibleLocations, filename)
+            results = binIndex.get(filename, [])
             if len(results) > 0:
                 # Create a symlink to the first found result
                 linkTarget = results[0]
-                if os.path.islink(initHostPath):
-                    os.remove(initHostPath)
-
-                os.symlink(hostToGuestPath(rootPath, linkTarget), initHostPath)
+                replaceLink(initHostPath, linkTarget)
+                binIndex = None
                 foundInits.append(init)
-                logger.debug(f"Fixed file {init} by creating a symlink to {linkTarget}.")
+                logger.debug("Fixed file %s by creating a symlink to %s.", init, linkTarget)
                 continue
             
     if len(foundInits) == 0:
@@ -151,12 +183,22 @@ def validateInits(rootPath: str, suspectedInits: list[str]) -> list[str]:
     
     foundInits.append("/firmadyne/preInit.sh")
     with open(initListFile, "w") as f:
-        for init in foundInits:
-            f.write(f"{init}\n")
+        f.write("".join(f"{init}\n" for init in foundInits))
     
     logger.info(f"Init commands found: {foundInits}")
     return foundInits
                 
+# (guest path, service name, start command) of the web servers findServices looks for
+_KNOWN_SERVICES = (
+    ("/etc/init.d/uhttpd", "uhttpd", "/etc/init.d/uhttpd start"),
+    ("/usr/bin/httpd", "httpd", "/usr/bin/httpd"),
+    ("/usr/sbin/httpd", "httpd", "/usr/sbin/httpd"),
+    ("/bin/goahead", "goahead", "/bin/goahead"),
+    ("/bin/alphapd", "alphapd", "/bin/alphapd"),
+    ("/bin/boa", "boa", "/bin/boa"),
+    ("/usr/sbin/lighttpd", "lighttpd", "/usr/sbin/lighttpd -f /etc/lighttpd/lighttpd.conf"), # for Ubiquiti firmwares
+)
+
 def findServices(rootPath: str) -> dict[str, str]:
     """
     Finds possible services in the image and emits a list of their paths.
@@ -181,54 +223,14 @@ def findServices(rootPath: str) -> dict[str, str]:
     name = ""
     startCommand = ""
     
-    if existsInGuest(rootPath, "/etc/init.d/uhttpd"):
-        services["/etc/init.d/uhttpd"] = "/etc/init.d/uhttpd start"
-        if not found:
-            found = True
-            name = "uhttpd"
-            startCommand = "/etc/init.d/uhttpd start"
-
-    if existsInGuest(rootPath, "/usr/bin/httpd"):
-        services["/usr/bin/httpd"] = "/usr/bin/httpd"
-        if not found:
-            found = True
-            name = "httpd"
-            startCommand = "/usr/bin/httpd"
-
-    if existsInGuest(rootPath, "/usr/sbin/httpd"):
-        services["/usr/sbin/httpd"] = "/usr/sbin/httpd"
-        if not found:
-            found = True
-            name = "httpd"
-            startCommand = "/usr/sbin/httpd"
-
-    if existsInGuest(rootPath, "/bin/goahead"):
-        services["/bin/goahead"] = "/bin/goahead"
-        if not found:
-            found = True
-            name = "goahead"
-            startCommand = "/bin/goahead"
-
-    if existsInGuest(rootPath, "/bin/alphapd"):
-        services["/bin/alphapd"] = "/bin/alphapd"
-        if not found:
-            found = True
-            name = "alphapd"
-            startCommand = "/bin/alphapd"
-
-    if existsInGuest(rootPath, "/bin/boa"):
-        services["/bin/boa"] = "/bin/boa"
-        if not found:
-            found = True
-            name = "boa"
-            startCommand = "/bin/boa"
-
-    if existsInGuest(rootPath, "/usr/sbin/lighttpd"): # for Ubiquiti firmwares
-        services["/usr/sbin/lighttpd"] = "/usr/sbin/lighttpd -f /etc/lighttpd/lighttpd.conf"
-        if not found:
-            found = True
-            name = "lighttpd"
-            startCommand = "/usr/sbin/lighttpd -f /etc/lighttpd/lighttpd.conf"
+    # The first service found, in table order, is the one firmadyne starts
+    for servicePath, serviceName, serviceCommand in _KNOWN_SERVICES:
+        if existsInGuest(rootPath, servicePath):
+            services[servicePath] = serviceCommand
+            if not found:
+                found = True
+                name = serviceName
+                startCommand = serviceCommand
             
     if found:
         with open(serviceFile, "w") as f:
@@ -244,6 +246,39 @@ def findServices(rootPath: str) -> dict[str, str]:
     
    
     
+# Hardcoded /var, /etc or /tmp file paths in a binary; groups 1 and 2 form the parent directory
+_REFERENCED_PATH_PREFIXES = (b"/var", b"/etc", b"/tmp")
+_REFERENCED_PATH_PATTERN = re.compile(rb'^(/var|/etc|/tmp)(.+)/([^/]+)$')
+
+# printf conversions that mark a referenced path as a template rather than a real directory
+_PRINTF_TOKENS = ("%s", "%d", "%c")
+
+# Below this many executables, starting worker processes costs more than the scan saves
+_PARALLEL_SCAN_MIN_FILES = 64
+# Worker processes scanning binaries; bounded so batch runs on big hosts do not start one per core each
+_SCAN_WORKERS = min(8, os.cpu_count() or 1)
+
+def _referencedDirs(filePath: str) -> list[str]:
+    """
+    Guest directories of the hardcoded file paths in a binary, in order of first occurrence,
+    leaving out printf-style templates. Only reads the file, so it can run in a worker process.
+    """
+    dirs = {}
+    # Only strings starting with one of the prefixes can match, so the rest of the binary is skipped
+    for path in stringsStartingWith(filePath, _REFERENCED_PATH_PREFIXES):
+        match = _REFERENCED_PATH_PATTERN.match(path)
+        if not match:
+            continue
+        dirPath = (match.group(1) + match.group(2)).decode("ascii")
+        # Check that the directory is not meant to be used with a function like printf;
+        # almost no path contains '%', so that single scan settles most of them
+        if "%" in dirPath and any(token in dirPath for token in _PRINTF_TOKENS):
+            continue
+        if "/tmp/services" in dirPath:
+            continue
+        dirs[dirPath] = None
+    return list(dirs)
+
 def createReferencedDirectories(rootPath: str) -> None:
     """
     Creates directories referenced by binaries in the image.
@@ -254,42 +289,75 @@ def createReferencedDirectories(rootPath: str) -> None:
     Raises:
         RuntimeError: If the executable locations do not exist.
     """
-    pattern = r'^(/var|/etc|/tmp)(.+)/([^/]+)$'
-    executableLocations = ["/bin", "/sbin", "/usr/bin", "/usr/sbin"]
-    createdDirs = set()
-    for location in executableLocations:
-        if not os.path.exists(guestToHostPath(rootPath, location)):
-            logger.warning(f"Executable location {location} does not exist")
-            continue
+    executables = []
+    scannedLocations = set()
+    # Applets are usually symlinks or hardlinks to one busybox binary; scan each file only once
+    scannedFiles = set()
+    with guestStatCache():
+        for location in _EXECUTABLE_LOCATIONS:
+            # Resolved inside the image once, so merged layouts (e.g. /bin -> /usr/bin) are walked only once
+            hostLocation = readGuestLink(guestToHostPath(rootPath, location), rootPath)
+            if not os.path.isdir(hostLocation):
+                logger.warning(f"Executable location {location} does not exist")
+                continue
+            if hostLocation in scannedLocations:
+                continue
+            scannedLocations.add(hostLocation)
+
+            for entry in iterFiles(hostLocation):
+                # Regular files with any execute bit: the guest's users have nothing to do with the
+                # host's, and as root os.access(X_OK) answered the same way. Executable fifos or
+                # device nodes would block or fail in strings().
+                try:
+                    if entry.is_symlink():
+                        # Followed inside the image, an absolute target would name a host file
+                        filePath = readGuestLink(entry.path, rootPath)
+                        st = os.stat(filePath)
+                    else:
+                        filePath = entry.path
+                        st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue  # broken symlink
+                if not (stat.S_ISREG(st.st_mode) and st.st_mode & 0o111):
+                    continue
+                fileId = (st.st_dev, st.st_ino)
+                if fileId in scannedFiles:
+                    continue
+                scannedFiles.add(fileId)
+                executables.append(filePath)
+
+    # Scanning binaries is CPU-bound and independent per file, so spread it over processes.
+    # forkserver: by now this process has run thread pools (tarball hashing, guest chmod) and holds
+    # pooled DB connections, and fork would copy their locks and sockets into every worker.
+    if len(executables) >= _PARALLEL_SCAN_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=_SCAN_WORKERS, mp_context=multiprocessing.get_context("forkserver")) as pool:
+            referencedDirs = list(pool.map(_referencedDirs, executables, chunksize=16))
+    else:
+        referencedDirs = [_referencedDirs(filePath) for filePath in executables]
 
-        for root, _, files in os.walk(guestToHostPath(rootPath, location)):
-            for file in files:
-                filePath = os.path.join(root, file)
-                # Check if the file has user execute permission
-                if not os.access(filePath, os.X_OK):
+    # Create directories serially, in the order the binaries were found. Referenced paths share
+    # their leading components, so memoize the symlink lookups; creating directories never adds
+    # or changes a symlink, so the cached link targets stay valid throughout.
+    createdDirs = set()
+    # Binaries share most of their paths; each directory is checked and created only once
+    seenDirs = set()
+    with guestStatCache():
+        for filePath, dirPaths in zip(executables, referencedDirs):
+            for dirPath in dirPaths:
+                if dirPath in seenDirs:
                     continue
-                
-                # Get all hardcoded paths in the binary
-                possiblePaths = strings(filePath)
-                for path in possiblePaths:
-                    match = re.match(pattern, path)
-                    if match:
-                        dirPath = match.group(1) + match.group(2)
-                        # Check that the directory is not meant to be used with a function like printf
-                        if "%s" in dirPath or "%d" in dirPath or "%c" in dirPath or "/tmp/services" in dirPath:
-                            continue
-                        fullPath = guestToHostPath(rootPath, dirPath)
-                        resolvedPath = readGuestLink(fullPath, rootPath)
-                        if os.path.exists(resolvedPath) and not os.path.isdir(resolvedPath):
-                            continue  # path exists as a file/device — don't clobber it
-                        os.makedirs(resolvedPath, exist_ok=True)
-                        if dirPath not in createdDirs:
-                            createdDirs.add(dirPath)
-                            logger.debug(f"Created directory: {fullPath} for binary: {hostToGuestPath(rootPath, filePath)}")
+                seenDirs.add(dirPath)
+                fullPath = guestToHostPath(rootPath, dirPath)
+                resolvedPath = readGuestLink(fullPath, rootPath)
+                if os.path.exists(resolvedPath) and not os.path.isdir(resolvedPath):
+                    continue  # path exists as a file/device — don't clobber it
+                os.makedirs(resolvedPath, exist_ok=True)
+                createdDirs.add(dirPath)
+                logger.debug("Created directory: %s for binary: %s", fullPath, hostToGuestPath(rootPath, filePath))
                         
     # Emit created directories to the log
     with open(guestToHostPath(rootPath, "/firmadyne/dir_log"), "w") as f:
-        f.writelines(f"{d}\n" for d in createdDirs)
+        f.write("".join(f"{d}\n" for d in createdDirs))
         
 def populateEtc(rootPath: str) -> None:
     """
@@ -312,12 +380,12 @@ def populateEtc(rootPath: str) -> None:
             fullPath = readGuestLink(guestToHostPath(rootPath, filePath), rootPath)
             parentPath = os.path.dirname(fullPath)
             if os.path.exists(parentPath) and not os.path.isdir(parentPath):
-                logger.debug(f"Skipping essential file {filePath}: parent {parentPath} is not a directory")
+                logger.debug("Skipping essential file %s: parent %s is not a directory", filePath, parentPath)
                 continue
             os.makedirs(parentPath, exist_ok=True)
             with open(fullPath, "w") as f:
                 f.write(content)
-            logger.debug(f"Created essential file: {fullPath}")  
+            logger.debug("Created essential file: %s", fullPath)  
                 
 def _mknod(path: str, nodeType: int, perms: int, major: int, minor: int) -> None:
     """Create a device node, falling back to sudo if the process lacks CAP_MKNOD."""
@@ -392,7 +460,7 @@ def populateDev(rootPath: str) -> None:
             nodePath = readGuestLink(guestToHostPath(rootPath, node), rootPath)
             if not os.path.lexists(nodePath):
                 _mknod(nodePath, attrs["type"], attrs["perms"], attrs["major"], attrs["minor"])
-                logger.debug(f"Created device node: {nodePath} with major: {attrs['major']} minor: {attrs['minor']}")
+                logger.debug("Created device node: %s with major: %s minor: %s", nodePath, attrs['major'], attrs['minor'])
 
 
     # Create gpio files
@@ -464,7 +532,7 @@ def addNvramEntries(rootPath: str) -> None:
     nvram_override_dir = guestToHostPath(rootPath, "/firmadyne/libnvram.override")
     os.makedirs(nvram_override_dir, exist_ok=True)
     for key, value in entries.items():
-        logger.debug(f"Adding NVRAM entry: {key} = {value}")
+        logger.debug("Adding NVRAM entry: %s = %s", key, value)
         with open(os.path.join(nvram_override_dir, key), "w") as f:
             f.write(value)
     
@@ -508,9 +576,18 @@ def fixFileSystem(rootPath: str) -> None:
         "/usr/sbin"
     ]
 
-    for dirPath in dirsToCreate:
-        fullPath = guestToHostPath(rootPath, dirPath)
-        os.makedirs(readGuestLink(fullPath, rootPath), exist_ok=True)
+    # Several entries share leading components and often resolve to the same place (e.g. /var/run
+    # and /tmp/var/run when /var links to /tmp/var). Creating directories never changes a symlink,
+    # so the lookups are memoized and each resolved directory is created once.
+    createdDirs = set()
+    with guestStatCache():
+        for dirPath in dirsToCreate:
+            fullPath = guestToHostPath(rootPath, dirPath)
+            resolvedPath = readGuestLink(fullPath, rootPath)
+            if resolvedPath in createdDirs:
+                continue
+            createdDirs.add(resolvedPath)
+            os.makedirs(resolvedPath, exist_ok=True)
 
     # Fix permissions on all **/bin and **/sbin directories
     # TODO: make this more robust by checking if the directories are linked
@@ -518,7 +595,7 @@ def fixFileSystem(rootPath: str) -> None:
     for dirPath in dirs:
         if os.path.exists(dirPath):
             recursiveGuestChmod(dirPath, 0o111, rootPath, addPerms=True)
-            logger.debug(f"Fixed permissions on directory: {dirPath}")
+            logger.debug("Fixed permissions on directory: %s", dirPath)
         else:
             logger.warning(f"Directory {dirPath} does not exist, skipping permission fix.")
 
@@ -646,8 +723,7 @@ def prepareImage(imgFilePath: str, mountPoint: str, arch: Architecture, endianes
         logger.error(f"Firmadyne scripts path {firmadyneScriptsPath} does not exist.")
         return None
     
-    if not os.path.exists(mountPoint):
-        os.makedirs(mountPoint, exist_ok=True)
+    os.makedirs(mountPoint, exist_ok=True)
     
     logger.info(f"Mounting image {imgFilePath} to {mountPoint}...")
 
@@ -657,8 +733,10 @@ def prepareImage(imgFilePath: str, mountPoint: str, arch: Architecture, endianes
         try:
             initFirmadyne(mp)
 
-            verifiedInits = validateInits(mp, possibleInits)
-            foundServices = findServices(mp)
+            # Lookup-heavy phases: the only paths they change are invalidated by validateInits
+            with guestStatCache():
+                verifiedInits = validateInits(mp, possibleInits)
+                foundServices = findServices(mp)
             
             fixFileSystem(mp)
             addNvramEntries(mp)
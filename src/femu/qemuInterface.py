@@ -120,7 +120,7 @@ class Qemu:
                     ["sudo", "ip", "tuntap", "del", "mode", "tap", "name", tapName],
                     check=False, capture_output=True,
                 )
-                logger.debug(f"TAP {tapName} removed")
+                logger.debug("TAP %s removed", tapName)
             except Exception as e:
                 logger.warning(f"TAP teardown error for {tapName}: {e}")
         self._tapDevices = []
@@ -1,21 +1,40 @@
 import subprocess
+import functools
 import logging
 import hashlib
 import tarfile
 import shutil
 import string
+import mmap
 import os
 import re
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 from .common import Architecture, Endianess
 
 from .dbInterface import DBInterface
 
+try:
+    import blake3
+except ImportError:  # optional, only needed for hashAlgorithm="blake3"
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
 _PARTITION_OFFSET = 1048576  # 1 MiB — matches the sfdisk default
+_DB_PAGE_SIZE = 1000         # rows per multi-row INSERT when creating objects
+_HASH_WORKERS = min(8, os.cpu_count() or 1)  # threads hashing rootfs members in getTarballInfo
+_HASH_OFFLOAD_SIZE = 1 << 16                 # smaller members are hashed inline
+_PRINTABLE_BYTES = frozenset(string.printable.encode("ascii"))
+
+# Architecture/endianess pairs the emulator can boot. UNKNOWN never appears here.
+_COMPATIBLE_CONFIGURATIONS = frozenset({
+    (Architecture.MIPS, Endianess.LITTLE),
+    (Architecture.MIPS, Endianess.BIG),
+    (Architecture.ARM, Endianess.LITTLE),
+})
 
 def checkCompatibility(arch: Architecture, endianess: Endianess) -> bool:
     """
@@ -28,62 +47,61 @@ def checkCompatibility(arch: Architecture, endianess: Endianess) -> bool:
     Returns:
         bool: True if compatible, False otherwise.
     """
-    if arch == Architecture.UNKNOWN or endianess == Endianess.UNKNOWN:
-        return False
-    
-    # Define compatible architectures and endianess
-    compatibleConfigurations = [
-        (Architecture.MIPS, Endianess.LITTLE),
-        (Architecture.MIPS, Endianess.BIG),
-        (Architecture.ARM, Endianess.LITTLE),
-    ]
-    
-    return (arch, endianess) in compatibleConfigurations
-
-def io_md5(target: str) -> str:
-    """
-    Calculate the MD5 hash of a file using buffered reading.
+    return (arch, endianess) in _COMPATIBLE_CONFIGURATIONS
+
+@functools.lru_cache(maxsize=256)
+def _cachedFileDigest(target: str, algorithm: str, mtimeNs: int, size: int) -> str:
+    # mtimeNs and size are part of the cache key, so a modified file misses
+    if algorithm == "blake3":
+        # Multithreaded over the whole mapping; much faster than md5/sha256 on large images
+        return blake3.blake3(max_threads=blake3.blake3.AUTO).update_mmap(target).hexdigest()
+
+    hasher = hashlib.new(algorithm)
+    with open(target, 'rb', buffering=0) as ifp:
+        if size == 0:
+            # mmap refuses empty files
+            return hasher.hexdigest()
+        # One zero-copy update over the whole mapping: hashlib releases the GIL
+        # for the entire call instead of once per block
+        with mmap.mmap(ifp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            hasher.update(mm)
+    return hasher.hexdigest()
+
+def fileDigest(target: str, algorithm: str = "sha256") -> str:
+    """
+    Calculate the hex digest of a file by hashing a read-only mmap of it.
+    Results are memoized on (path, mtime, size) so repeated lookups of an
+    unchanged firmware image do not rehash it.
     Args:
         target (str): Path to the file.
+        algorithm (str): Any hashlib algorithm name, or "blake3" if the blake3 package is installed.
     Returns:
-        str: MD5 hash of the file.
-    Raises:
-        FileNotFoundError: If the file does not exist.
-        PermissionError: If the file cannot be read.
+        str: Hex digest of the file.
     """
-    if not os.path.exists(target):
-        raise FileNotFoundError(f"File {target} does not exist.")
-    if not os.access(target, os.R_OK):
-        raise PermissionError(f"File {target} is not readable.")
-    if not os.path.isfile(target):
-        raise ValueError(f"Target {target} is not a file.")
-    
-    blocksize = 65536
-    hasher = hashlib.md5()
+    if algorithm == "blake3" and blake3 is None:
+        raise ValueError("The blake3 hash algorithm requires the 'blake3' package (pip install femu[blake3]).")
+    st = os.stat(target)
+    return _cachedFileDigest(os.path.realpath(target), algorithm, st.st_mtime_ns, st.st_size)
 
-    with open(target, 'rb') as ifp:
-        buf = ifp.read(blocksize)
-        while buf:
-            hasher.update(buf)
-            buf = ifp.read(blocksize)
-        return hasher.hexdigest()
-
-def checkArch(tarballPath: str, tempDirID: str) -> tuple[Architecture, Endianess]:
+def checkArch(tarballPath: str, tempDirID: str) -> tuple[Architecture, Endianess, int]:
     """
     Checks the architecture and endianess of the firmware in a tarball.
     Args:
         tarballPath (str): Path to the tarball file.
         tempDirID (str): Temporary directory identifier for extraction.
     Returns:
-        tuple[Architecture, Endianess]: A tuple containing the architecture and endianess.
+        tuple[Architecture, Endianess, int]: The architecture, the endianess and the total size of the
+        regular files in the tarball, collected while listing its members.
     Raises:
         RuntimeError: If the tarball cannot be read or if no executables are found."""
 
     with tarfile.open(tarballPath, "r") as tar:
     
         executables = []
+        rootfsSize = 0
         for member in tar.getmembers():
             if member.isfile():
+                rootfsSize += member.size
                 if any([member.name.find(binary) != -1 for binary in ["/busybox", "/alphapd", "/boa", "/http", "/hydra", "/helia", "/webs"]]):
                     executables.append(member)
                 elif any([member.name.find(path) != -1 for path in ["/sbin/", "/bin/"]]):
@@ -125,7 +143,7 @@ def checkArch(tarballPath: str, tempDirID: str) -> tuple[Architecture, Endianess
         # Clean up the temporary directory
         shutil.rmtree(os.path.join("/tmp", tempDirID))
 
-    return arch, endianess
+    return arch, endianess, rootfsSize
 
 def strings(filePath:str, minLength:int = 4):
     """
@@ -136,79 +154,152 @@ def strings(filePath:str, minLength:int = 4):
         minLength (int): Minimum length of strings to extract.
 
     Yields:
-        str: Printable strings from the binary file that are at least `minLength` characters long.
+        bytes: Printable ASCII runs from the binary file that are at least `minLength` bytes long.
+        They are not decoded; callers decode only the strings they keep.
+    """
+    try:
+        with open(filePath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in _printableRunPattern(minLength).finditer(mm):
+                    yield match.group()
+    except OSError as e:
+        raise RuntimeError(f"Failed to read file {filePath}: {e}")
+
+@functools.lru_cache(maxsize=None)
+def _printableRunPattern(minLength: int) -> "re.Pattern[bytes]":
+    # Same byte set as _PRINTABLE_BYTES; the scan runs inside the regex engine instead of a Python loop
+    return re.compile(rb"[\t\n\x0b\x0c\r\x20-\x7e]{%d,}" % max(minLength, 1))
+
+def _literalPositions(mm: mmap.mmap, prefixes: tuple[bytes, ...]):
+    # Every offset where one of the prefixes occurs, in file order. mmap.find is a memmem scan.
+    positions = []
+    for prefix in prefixes:
+        pos = mm.find(prefix)
+        while pos != -1:
+            positions.append(pos)
+            pos = mm.find(prefix, pos + 1)
+    positions.sort()
+    return positions
+
+def stringsStartingWith(filePath: str, prefixes: tuple[bytes, ...], minLength: int = 4):
+    """
+    Yields the strings `strings` would return that start with one of `prefixes`, without
+    scanning the rest of the file: the prefixes are located with mmap.find and only the
+    printable runs that begin there are read.
+
+    Args:
+        filePath (str): Path to the binary file.
+        prefixes (tuple[bytes, ...]): Printable literals the strings must start with.
+        minLength (int): Minimum length of strings to extract.
+
+    Yields:
+        bytes: Matching printable runs, in file order.
+    """
+    runPattern = _printableRunPattern(minLength)
+    try:
+        with open(filePath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for pos in _literalPositions(mm, prefixes):
+                    # Only a prefix at the start of a run; otherwise it is inside a longer string
+                    if pos > 0 and mm[pos - 1] in _PRINTABLE_BYTES:
+                        continue
+                    match = runPattern.match(mm, pos)
+                    if match:
+                        yield match.group()
+    except OSError as e:
+        raise RuntimeError(f"Failed to read file {filePath}: {e}")
+
+def findTaggedStrings(filePath: str, pattern: "re.Pattern[bytes]", prefixes: tuple[bytes, ...] | None = None):
+    """
+    Searches a binary file for a bytes pattern in a single pass over an mmap
+    of the file, instead of splitting the whole file into strings first.
+
+    Args:
+        filePath (str): Path to the binary file.
+        pattern (re.Pattern[bytes]): Compiled pattern whose alternatives each capture one
+            named group. It must only match printable bytes.
+        prefixes (tuple[bytes, ...] | None): Literals that every match of `pattern` starts with.
+            When given, the file is searched for these with mmap.find and the pattern is only
+            tried at those offsets, which is much faster than letting the regex walk every byte.
+
+    Yields:
+        tuple[str, str, str]: The name of the group that matched, its value and the printable
+        string (as `strings` would return it) that contains the match. Only the first match
+        in each string is reported.
     """
     try:
         with open(filePath, 'rb') as f:
-            result = ""
-            for byte in f.read():
-                if chr(byte) in string.printable:
-                    result += chr(byte)
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if prefixes:
+                    matches = (pattern.match(mm, pos) for pos in _literalPositions(mm, prefixes))
                 else:
-                    if len(result) >= minLength:
-                        yield result
-                    result = ""
-            if len(result) >= minLength:
-                yield result
-    except Exception as e:
+                    matches = pattern.finditer(mm)
+                size = len(mm)
+                lastEnd = -1
+                for match in matches:
+                    if match is None:
+                        continue
+                    start, end = match.span()
+                    if start < lastEnd:
+                        continue
+                    while start > 0 and mm[start - 1] in _PRINTABLE_BYTES:
+                        start -= 1
+                    while end < size and mm[end] in _PRINTABLE_BYTES:
+                        end += 1
+                    lastEnd = end
+                    yield match.lastgroup, match.group(match.lastindex).decode("ascii"), mm[start:end].decode("ascii")
+    except OSError as e:
         raise RuntimeError(f"Failed to read file {filePath}: {e}")
     
-    
-def getFilesInfo(tarballPath: str) -> list[tuple[str, str, int, int, int]]:
+def _md5Hex(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+def getTarballInfo(tarballPath: str) -> tuple[list[tuple[str, str, int, int, int]], list[tuple[str, str]]]:
     """
-    Extracts file information from a tarball.
+    Collects regular file and symbolic link information from a tarball in a single pass,
+    so the (usually compressed) archive is only decompressed once.
     
     Args:
         tarballPath (str): Path to the tarball file.
     
     Returns:
-        list[tuple[str, str, int, int, int]]: List of tuples containing file information.
-        Each tuple contains:
-            - name (str)
-            - hash (str)
-            - uid  (int)
-            - gid  (int)
-            - mode (int)
+        tuple[list[tuple[str, str, int, int, int]], list[tuple[str, str]]]: The regular files, as
+        (name, md5 hash, uid, gid, mode) tuples, and the symbolic links, as (name, target) tuples.
     """
     try:
-        with tarfile.open(tarballPath, "r") as tar:
+        # Decompression is sequential, so this thread keeps reading members while larger ones
+        # are hashed on the pool (hashlib releases the GIL); small ones are cheaper to hash inline
+        with tarfile.open(tarballPath, "r") as tar, ThreadPoolExecutor(max_workers=_HASH_WORKERS) as pool:
             file_info = []
-            for member in tar.getmembers():
+            links_info = []
+            for member in tar:
+                # we use member.name[1:] to get rid of the . at the beginning of the path
                 if member.isfile():
-                    # we use member.name[1:] to get rid of the . at the beginning of the path
                     fileContent = tar.extractfile(member)
                     if fileContent is None:
                         continue
-                    file_hash = hashlib.md5(fileContent.read()).hexdigest()
+                    data = fileContent.read()
+                    if len(data) < _HASH_OFFLOAD_SIZE:
+                        file_hash = hashlib.md5(data).hexdigest()
+                    else:
+                        file_hash = pool.submit(_md5Hex, data)
                     
                     file_info.append((member.name[1:], file_hash, member.uid, member.gid, member.mode))
-            return file_info
-    except Exception as e:
-        raise RuntimeError(f"Failed to read tarball {tarballPath}: {e}")
-
-def getLinksInfo(tarballPath: str) -> list[tuple[str, str]]:
-    """
-    Extracts symbolic link information from a tarball.
-    
-    Args:
-        tarballPath (str): Path to the tarball file.
-    
-    Returns:
-        list[tuple[str, str]]: List of tuples containing symbolic link information.
-        Each tuple contains:
-            - name (str)
-            - target (str)
-    """
-    try:
-        with tarfile.open(tarballPath, "r") as tar:
-            links_info = []
-            for member in tar.getmembers():
-                if member.issym():
+                elif member.issym():
                     links_info.append((member.name[1:], member.linkname))
-            return links_info
+            # Swap the pool futures for their digests, keeping member order
+            file_info = [(name, h if isinstance(h, str) else h.result(), uid, gid, mode)
+                         for name, h, uid, gid, mode in file_info]
+            return file_info, links_info
     except Exception as e:
         raise RuntimeError(f"Failed to read tarball {tarballPath}: {e}")
-    
+
 def getObjectIds(fileList: list[tuple[str, str, int, int, int]] | list[str], dbIp: str, dbPort: int = 5432, addMissing: bool = True) -> tuple[dict[str, int], list[str]]:
     """
     Retrieves object IDs from the database for a list of files.
@@ -241,9 +332,10 @@ def getObjectIds(fileList: list[tuple[str, str, int, int, int]] | list[str], dbI
         raise TypeError("fileList must be a list of tuples or a list of strings.")
     
     
-    with DBInterface(dbIp, dbPort) as cursor:
-        cursor.execute("SELECT id,hash FROM object WHERE hash IN %s", (tuple(hashes),))
-        results = cursor.fetchall()
+    db = DBInterface(dbIp, dbPort)
+    with db:
+        # ANY($1) takes the whole list as one array parameter, so the statement is the same for any number of hashes
+        results = db.executePrepared("femu_object_ids", "SELECT id, hash FROM object WHERE hash = ANY($1)", (hashes,)).fetchall()
         objectIds = {row[1]: row[0] for row in results}
         
     missingHashes = [hash for hash in hashes if hash not in objectIds]
@@ -271,21 +363,28 @@ def createNewObjects(hashes: list[str], dbIp: str, dbPort: int) -> dict[str, int
     if not hashes:
         return {}
     
-    query = """INSERT INTO object (hash) VALUES (%s) RETURNING id"""
-    newObjects = {}
+    # Another run may insert the same hash concurrently; the no-op update makes RETURNING
+    # report the existing row instead of failing the whole session on object_hash_key.
+    # Hashes are deduplicated below, as one statement cannot update the same row twice.
+    query = """INSERT INTO object (hash) VALUES %s
+               ON CONFLICT (hash) DO UPDATE SET hash = EXCLUDED.hash
+               RETURNING id, hash"""
     
-    with DBInterface(dbIp, dbPort) as cursor:
-        for hash in hashes:
-            cursor.execute(query, (hash,))
-            result = cursor.fetchone()
-            if result:
-                newObjects[hash] = result[0]
-            else:
-                raise RuntimeError(f"Failed to create new object for hash {hash}.")
+    db = DBInterface(dbIp, dbPort)
+    with db:
+        rows = db.insertMany(query, [(hash,) for hash in dict.fromkeys(hashes)], pageSize=_DB_PAGE_SIZE, fetch=True)
+    
+    newObjects = {row[1]: row[0] for row in rows}
+    for hash in hashes:
+        if hash not in newObjects:
+            raise RuntimeError(f"Failed to create new object for hash {hash}.")
     
     return newObjects
     
     
+# Column order of the rows bulk-loaded into object_to_image
+_OBJECT_TO_IMAGE_COLUMNS = ("iid", "oid", "filename", "regular_file", "uid", "gid", "permissions")
+
 def insertObjectsToImage(imageId: str, objectIds: dict[str, int], fileList: list[tuple[str, str, int, int, int]], dbIp: str, dbPort: int = 5432) -> None:
     """
     Inserts object IDs into the object_to_image table.
@@ -305,27 +404,20 @@ def insertObjectsToImage(imageId: str, objectIds: dict[str, int], fileList: list
     if not isinstance(fileList, list) or not all(isinstance(file, tuple) and len(file) == 5 for file in fileList):
         raise TypeError("fileList must be a list of tuples containing file information.")
     
-    query = """INSERT INTO object_to_image (iid, oid, filename, regular_file, uid, gid, permissions) VALUES (%(iid)s, %(oid)s, %(filename)s, %(regular_file)s, %(uid)s, %(gid)s, %(mode)s)"""
-    
     fileDict = {file[1]: file for file in fileList}
     
-    with DBInterface(dbIp, dbPort) as cursor:
-        for hash, oid in objectIds.items():
-            if hash in fileDict:
-                fileInfo = fileDict[hash]
-                cursor.execute(query, {
-                    'iid': imageId,
-                    'oid': oid,
-                    'filename': fileInfo[0],
-                    'regular_file': True,
-                    'uid': fileInfo[2],
-                    'gid': fileInfo[3],
-                    'mode': fileInfo[4]
-                })
-            else:
-                raise RuntimeError(f"File {hash} not found in the provided file list.")
-        
-        cursor.connection.commit()
+    # Rows follow _OBJECT_TO_IMAGE_COLUMNS
+    rows = []
+    for hash, oid in objectIds.items():
+        if hash in fileDict:
+            fileInfo = fileDict[hash]
+            rows.append((imageId, oid, fileInfo[0], True, fileInfo[2], fileInfo[3], fileInfo[4]))
+        else:
+            raise RuntimeError(f"File {hash} not found in the provided file list.")
+    
+    db = DBInterface(dbIp, dbPort)
+    with db:
+        db.copyRows("object_to_image", _OBJECT_TO_IMAGE_COLUMNS, rows)
         
         
 def insertLinksToImage(imageId: str, links: list[tuple[str, str]], dbIp: str, dbPort: int = 5432) -> None:
@@ -347,57 +439,12 @@ def insertLinksToImage(imageId: str, links: list[tuple[str, str]], dbIp: str, db
     if not isinstance(links, list) or not all(isinstance(link, tuple) and len(link) == 2 for link in links):
         raise TypeError("links must be a list of tuples containing symbolic link information.")
     
-    query = """INSERT INTO object_to_image (iid, oid, filename, regular_file, uid, gid, permissions) VALUES (%(iid)s, %(oid)s, %(filename)s, %(regular_file)s, %(uid)s, %(gid)s, %(mode)s)"""
-    
-    with DBInterface(dbIp, dbPort) as cursor:
-        for name, target in links:
-            cursor.execute(query, {
-                'iid': imageId,
-                'oid': 0,  # Symbolic links do not have an object ID
-                'filename': name,
-                'regular_file': False,
-                'uid': None,  # Default UID for symbolic links
-                'gid': None,  # Default GID for symbolic links
-                'mode': 0o777  # Default permissions for symbolic links
-            })
-        
-        cursor.connection.commit()
-        
-def dd(inputFile: str, outputFile: str, count: int , blockSize: int = 512) -> None:
-    """
-    Copies data from inputFile to outputFile using dd-like functionality.
-
-    Args:
-        inputFile (str): Path to the input file.
-        outputFile (str): Path to the output file.
-        count (int): Number of blocks to copy.
-        blockSize (int): Size of each block in bytes. Default is 512 bytes.
-
-    Raises:
-        RuntimeError: If the copy operation fails.
-    """
-    if not os.path.exists(inputFile):
-        raise FileNotFoundError(f"Input file {inputFile} does not exist or is not a file.")
-
-    if not os.access(inputFile, os.R_OK):
-        raise PermissionError(f"Input file {inputFile} is not readable.")
-
-    output_dir = os.path.dirname(outputFile) or "./"
-    if not os.path.isdir(output_dir):
-        raise ValueError(f"Invalid directory for the output file: {output_dir}")
-
-    if not os.access(output_dir, os.W_OK):
-        raise PermissionError(f"Cannot write to the directory: {output_dir}")
-
-    try:
-        with open(inputFile, 'rb') as infile, open(outputFile, 'wb') as outfile:
-            for _ in range(count):
-                data = infile.read(blockSize)
-                if not data:
-                    break
-                outfile.write(data)
-    except Exception as e:
-        raise RuntimeError(f"Failed to copy data from {inputFile} to {outputFile}: {e}")
+    # Symbolic links have no object ID (oid 0), no owner and default 0o777 permissions
+    rows = [(imageId, 0, name, False, None, None, 0o777) for name, target in links]
+    
+    db = DBInterface(dbIp, dbPort)
+    with db:
+        db.copyRows("object_to_image", _OBJECT_TO_IMAGE_COLUMNS, rows)
         
 def createRawImg(path: str, size: int) -> str:
     """
@@ -425,7 +472,13 @@ def createRawImg(path: str, size: int) -> str:
         raise FileExistsError(f"Raw image file {path} already exists. Please choose a different path or remove the existing file.")
     
     # Create the raw image file
-    dd(inputFile="/dev/zero", outputFile=path, count=size // 512, blockSize=512)
+    # Sparse file: blocks are only allocated as the filesystem writes them, instead of
+    # writing `size` bytes of zeros up front
+    try:
+        with open(path, "wb") as f:
+            f.truncate(size)
+    except OSError as e:
+        raise RuntimeError(f"Failed to create raw image file {path}: {e}")
     if not os.path.exists(path):
         raise RuntimeError(f"Failed to create raw image file at {path}.")
     
@@ -456,6 +509,30 @@ def createRawImg(path: str, size: int) -> str:
     
     return path
 
+def unpackArchive(archivePath: str, dst: str) -> None:
+    """
+    Extracts an archive into dst. Uses bsdtar (libarchive) or tar when one is installed,
+    which decompress and write entries natively, and falls back to shutil.unpack_archive.
+
+    Args:
+        archivePath (str): Path to the archive, e.g. the extracted rootfs tarball.
+        dst (str): Existing directory to extract into.
+
+    Raises:
+        RuntimeError: If the archive cannot be extracted.
+    """
+    tar = shutil.which("bsdtar") or shutil.which("tar")
+    if tar:
+        result = subprocess.run([tar, "-xf", archivePath, "-C", dst], capture_output=True, text=True)
+        if result.returncode == 0:
+            return
+        logger.warning("%s failed to extract %s, retrying with Python: %s", tar, archivePath, result.stderr.strip())
+
+    try:
+        shutil.unpack_archive(archivePath, dst)
+    except Exception as e:
+        raise RuntimeError(f"Failed to extract {archivePath} to {dst}: {e}")
+
 def runAsRoot(command: list[str]) -> subprocess.CompletedProcess:
     """
     Runs a command as root using sudo.
@@ -644,6 +721,67 @@ def find(searchPath: str | list[str], fileNames: str | list[str]) -> list[str]:
 
     return foundFiles
 
+def iterFiles(rootPath: str):
+    """
+    Walks a directory tree like os.walk, without following directory symlinks, and yields
+    the entries os.walk would list as files: everything that is not a directory, including
+    symlinks to files and broken symlinks. Entries are yielded in os.walk order.
+
+    Args:
+        rootPath (str): Path to the root directory.
+
+    Yields:
+        os.DirEntry: The file entries; entry.path is the full path.
+    """
+    try:
+        with os.scandir(rootPath) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    subdirs = []
+    for entry in entries:
+        try:
+            isDir = entry.is_dir()
+        except OSError:
+            isDir = False
+        if not isDir:
+            yield entry
+        elif not entry.is_symlink():
+            subdirs.append(entry.path)
+
+    for subdir in subdirs:
+        yield from iterFiles(subdir)
+
+def indexFiles(searchPath: str | list[str]) -> dict[str, list[str]]:
+    """
+    Walks one or more directory trees once and maps every file name to the paths where it
+    occurs, in the order find() would report them. Use it instead of repeated find() calls
+    over the same trees.
+
+    Args:
+        searchPath (str | list[str]): Path or list of paths to the root directories.
+
+    Returns:
+        dict[str, list[str]]: File name to the list of paths where it is found.
+    """
+    if isinstance(searchPath, str):
+        searchPath = [searchPath]
+    elif not isinstance(searchPath, list):
+        raise TypeError("searchPath must be a string or a list of strings.")
+
+    index: dict[str, list[str]] = {}
+
+    for rootPath in searchPath:
+        if not os.path.exists(rootPath):
+            logger.warning(f"indexFiles: skipping non-existent path {rootPath}")
+            continue
+
+        for entry in iterFiles(rootPath):
+            index.setdefault(entry.name, []).append(entry.path)
+
+    return index
+
 def findDirs(searchPath: str | list[str], dirNames: str | list[str]) -> list[str]:
     """
     Finds all occurrences of one or more directories in one or more directory trees.
@@ -700,9 +838,9 @@ def findStringInBinFile(filePath: str, searchString: str) -> bool:
     if not os.access(filePath, os.R_OK):
         raise PermissionError(f"File {filePath} is not readable.")
     
-    stringsFound = strings(filePath)
-    for stringFound in stringsFound:
-        if searchString in stringFound:
+    needle = searchString.encode()
+    for stringFound in strings(filePath):
+        if needle in stringFound:
             return True
     return False
 